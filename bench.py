@@ -0,0 +1,401 @@
+from aiohttp import web
+import argparse, asyncio, json, multiprocessing, os, random, socket, statistics, struct, subprocess, sys, tempfile, time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak memory is then left out of the report
+    resource = None
+
+import bot
+
+# Offline load test: a local stand-in for the Dawn API plus fake HTTP/SOCKS5
+# proxies, all with injectable faults, run in a separate process so the CPU
+# and memory figures belong to the bot alone.
+#
+#   python bench.py --accounts 10000 --proxies 100 --duration 60
+#   python bench.py --proxy-type socks5 --proxy-drop-rate 0.05 -- --workers 500
+#   python bench.py --startup --startup-budget 140
+#
+# Anything after "--" is passed through as bot settings. --startup measures
+# cold start (import plus Dawn()) instead and fails when over budget.
+
+STARTUP_SNIPPET = "import time; started = time.perf_counter(); import bot; bot.Dawn(); print(time.perf_counter() - started)"
+
+class Faults:
+    # Rates are probabilities per request (API) or per connection (proxies)
+    __slots__ = ("latency", "error_rate", "rate_limit_rate", "drop_rate")
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, rate_limit_rate: float = 0.0, drop_rate: float = 0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.drop_rate = drop_rate
+
+    def pick(self) -> str | None:
+        roll = random.random()
+        for fault, rate in (("drop", self.drop_rate), ("error", self.error_rate), ("rate_limit", self.rate_limit_rate)):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    async def delay(self):
+        if self.latency:
+            await asyncio.sleep(random.expovariate(1 / self.latency))
+
+class MockDawnAPI:
+    # Serves the keepalive and getpoint endpoints with the response shapes the
+    # bot expects; points grow now and then so earnings deltas get exercised.
+    def __init__(self, faults: Faults):
+        self.faults = faults
+        self.counts: dict[str, int] = {}
+        self.points: dict[str, int] = {}
+
+    def count(self, name: str):
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    async def respond(self, request: web.Request, endpoint: str, payload):
+        self.count(endpoint)
+        await self.faults.delay()
+        fault = self.faults.pick()
+        if fault:
+            self.count(fault)
+        if fault == "drop":
+            # Close the connection mid-request; the response below is never sent
+            request.transport.close()
+            return web.Response(status=204)
+        if fault == "error":
+            return web.json_response({"message": "mock server error"}, status=500)
+        if fault == "rate_limit":
+            return web.json_response({"message": "mock rate limit"}, status=429, headers={"Retry-After": "1"})
+        return web.json_response({"data": payload(request)})
+
+    def keepalive(self, request: web.Request) -> dict:
+        return {"success": True, "servername": "mock"}
+
+    def getpoint(self, request: web.Request) -> dict:
+        app_id = request.query.get("appid", "")
+        points = self.points.get(app_id, 0) + (random.random() < 0.2)
+        self.points[app_id] = points
+        return {
+            "rewardPoint": {"points": points, "twitter_x_id_points": 0, "discordid_points": 0, "telegramid_points": 0},
+            "referralPoint": {"commission": 0},
+        }
+
+    def app(self) -> web.Application:
+        async def keepalive(request):
+            return await self.respond(request, "keepalive", self.keepalive)
+
+        async def getpoint(request):
+            return await self.respond(request, "getpoint", self.getpoint)
+
+        async def index(request):
+            # Target of the bot's proxy health checks
+            return web.Response(text="ok")
+
+        app = web.Application()
+        app.router.add_post("/chromeapi/dawn/v1/userreward/keepalive", keepalive)
+        app.router.add_get("/api/atom/v1/userreferral/getpoint", getpoint)
+        app.router.add_get("/", index)
+        return app
+
+async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while data := await reader.read(65536):
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+class FakeProxy:
+    # Just enough of HTTP CONNECT or SOCKS5 (no auth) to tunnel to the mock API
+    SOCKS_REPLIES = {None: 0x00, "error": 0x01, "rate_limit": 0x02}
+    HTTP_REPLIES = {None: "200 Connection established", "error": "502 Bad Gateway", "rate_limit": "429 Too Many Requests"}
+
+    def __init__(self, protocol: str, faults: Faults, counts: dict):
+        self.protocol = protocol
+        self.faults = faults
+        self.counts = counts
+
+    async def http_target(self, reader: asyncio.StreamReader) -> tuple[str, int]:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        method, target = request_line.split()[:2]
+        if method != b"CONNECT":
+            raise ValueError("only CONNECT is supported")
+        host, port = target.decode().rsplit(":", 1)
+        return host, int(port)
+
+    async def socks5_target(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> tuple[str, int]:
+        _, methods = await reader.readexactly(2)
+        await reader.readexactly(methods)
+        writer.write(b"\x05\x00")
+        _, command, _, address_type = await reader.readexactly(4)
+        if command != 1:
+            raise ValueError("only CONNECT is supported")
+        if address_type == 1:
+            host = socket.inet_ntoa(await reader.readexactly(4))
+        elif address_type == 3:
+            host = (await reader.readexactly((await reader.readexactly(1))[0])).decode()
+        else:
+            host = socket.inet_ntop(socket.AF_INET6, await reader.readexactly(16))
+        port, = struct.unpack("!H", await reader.readexactly(2))
+        return host, port
+
+    def reply(self, writer: asyncio.StreamWriter, fault: str | None):
+        if self.protocol == "socks5":
+            writer.write(bytes([5, self.SOCKS_REPLIES[fault], 0, 1, 0, 0, 0, 0, 0, 0]))
+        else:
+            writer.write(f"HTTP/1.1 {self.HTTP_REPLIES[fault]}\r\n\r\n".encode())
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.counts["connections"] = self.counts.get("connections", 0) + 1
+        try:
+            if self.protocol == "socks5":
+                target = await self.socks5_target(reader, writer)
+            else:
+                target = await self.http_target(reader)
+            await self.faults.delay()
+            fault = self.faults.pick()
+            if fault:
+                self.counts[fault] = self.counts.get(fault, 0) + 1
+            if fault == "drop":
+                writer.close()
+                return
+            if fault:
+                self.reply(writer, fault)
+                await writer.drain()
+                writer.close()
+                return
+            upstream_reader, upstream_writer = await asyncio.open_connection(*target)
+            self.reply(writer, None)
+            await writer.drain()
+            await asyncio.gather(pipe(reader, upstream_writer), pipe(upstream_reader, writer))
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError, OSError):
+            writer.close()
+
+async def serve_mock(options: dict, ready, stop, results):
+    api = MockDawnAPI(Faults(**options["api_faults"]))
+    runner = web.AppRunner(api.app(), access_log=None, handle_signals=False)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", options["port"], backlog=4096).start()
+    proxy_counts: dict[str, int] = {}
+    servers = []
+    if options["proxy_type"] != "none":
+        proxy_faults = Faults(**options["proxy_faults"])
+        for index in range(options["proxies"]):
+            proxy = FakeProxy(options["proxy_type"], proxy_faults, proxy_counts)
+            servers.append(await asyncio.start_server(proxy.handle, "127.0.0.1", options["port"] + 1 + index, backlog=1024))
+    ready.set()
+    await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+    results.put({"api": api.counts, "proxies": proxy_counts})
+    for server in servers:
+        server.close()
+    await runner.cleanup()
+
+def run_mock(options: dict, ready, stop, results):
+    # Entry point of the mock process; must stay importable for spawn
+    asyncio.run(serve_mock(options, ready, stop, results))
+
+def rss_mb() -> float | None:
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+def latency_report(stats: "bot.RequestStats") -> dict:
+    return {
+        f"p{int(q * 100)}": round(stats.latency.quantile(q) or 0, 4) for q in (0.5, 0.9, 0.99)
+    } | {"mean": round(stats.latency.total / stats.latency.count, 4) if stats.latency.count else 0}
+
+async def run_bot(options: argparse.Namespace, bot_args: list[str], workdir: Path) -> dict:
+    accounts_file = workdir / "accounts.json"
+    with open(accounts_file, "w") as file:
+        json.dump([{"Email": f"bench{index}@example.com", "Token": f"token-{index}"} for index in range(options.accounts)], file)
+    proxy_file = workdir / "proxy.txt"
+    with open(proxy_file, "w") as file:
+        for index in range(options.proxies if options.proxy_type != "none" else 0):
+            file.write(f"{options.proxy_type}://127.0.0.1:{options.port + 1 + index}\n")
+
+    settings = bot.parse_settings([
+        "--headless", "--base-api", f"http://127.0.0.1:{options.port}",
+        "--accounts-file", str(accounts_file), "--proxy-file", str(proxy_file),
+        "--proxy-mode", "none" if options.proxy_type == "none" else "private", "--no-proxy-download",
+        "--ping-interval", str(options.ping_interval), "--earning-interval", str(options.earning_interval),
+        "--state-file", str(workdir / "state.json"), "--state-interval", "0",
+        "--watch-interval", "0", "--metrics-interval", "0", "--log-format", "plain",
+        *bot_args,
+    ])
+    dawn = bot.Dawn()
+    dawn.configure(settings)
+    log_file = open(options.bot_log or os.devnull, "w")
+    dawn.log_sink.stream = log_file
+
+    rss_before = rss_mb()
+    cpu_started = time.process_time()
+    started = time.monotonic()
+    accounts = dawn.load_accounts()
+    farming = asyncio.create_task(dawn.start_farming(accounts, dawn.proxy_choice))
+    while dawn.scheduler is None and not farming.done():
+        await asyncio.sleep(0.05)
+    setup_seconds = time.monotonic() - started
+    await asyncio.sleep(max(options.duration - setup_seconds, 0))
+    rss_after = rss_mb()
+    elapsed = time.monotonic() - started
+    cpu_seconds = time.process_time() - cpu_started
+    farming.cancel()
+    await asyncio.gather(farming, return_exceptions=True)
+    await dawn.session_pool.close()
+    log_file.close()
+
+    stats = dawn.metrics._get("global", "")
+    endpoints = {
+        name: {"requests": endpoint_stats.requests, "ok": endpoint_stats.outcomes.get("ok", 0), **latency_report(endpoint_stats)}
+        for (scope, name), endpoint_stats in dawn.metrics.stats.items() if scope == "endpoint"
+    }
+    return {
+        "accounts": options.accounts,
+        "proxies": options.proxies if options.proxy_type != "none" else 0,
+        "proxy_type": options.proxy_type,
+        "duration": round(elapsed, 2),
+        "setup_seconds": round(setup_seconds, 2),
+        "requests": stats.requests,
+        "requests_per_second": round(stats.requests / elapsed, 1),
+        "success_rate": round(stats.success_rate or 0, 4),
+        "retries": stats.retries,
+        "outcomes": dict(sorted(stats.outcomes.items())),
+        "latency": latency_report(stats),
+        "endpoints": endpoints,
+        "cpu_seconds": round(cpu_seconds, 2),
+        "cpu_percent": round(cpu_seconds * 100 / elapsed, 1),
+        "rss_mb": round(rss_after, 1) if rss_after is not None else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1) if resource else None,
+        "kb_per_account": (
+            round((rss_after - rss_before) * 1024 / options.accounts, 2)
+            if rss_after is not None and rss_before is not None and options.accounts else None
+        ),
+    }
+
+def measure_startup(runs: int, budget_ms: float) -> int:
+    # Fresh interpreters with a warm bytecode cache, which is what a restarted
+    # worker or container sees
+    cwd = Path(__file__).resolve().parent
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    subprocess.run([sys.executable, "-c", "import bot"], cwd=cwd, env=env, check=True)
+    timings = sorted(
+        float(subprocess.run([sys.executable, "-c", STARTUP_SNIPPET], cwd=cwd, env=env,
+                             capture_output=True, text=True, check=True).stdout) * 1000
+        for _ in range(runs)
+    )
+    profile = subprocess.run([sys.executable, "-X", "importtime", "-c", "import bot"], cwd=cwd, env=env,
+                             capture_output=True, text=True, check=True).stderr
+    # Direct imports of bot.py sit one level deep in the importtime tree
+    imports = []
+    for line in profile.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].startswith("   ") and not fields[2].startswith("    "):
+            imports.append((int(fields[1]) / 1000, fields[2].strip()))
+    median = statistics.median(timings)
+    print(f"Cold start (import + Dawn()): median {median:.0f} ms, min {timings[0]:.0f} ms, "
+          f"max {timings[-1]:.0f} ms over {runs} runs | budget {budget_ms:.0f} ms")
+    print("Slowest imports: " + ", ".join(f"{name} {ms:.0f} ms" for ms, name in sorted(imports, reverse=True)[:6]))
+    if median > budget_ms:
+        print(f"✗ Over budget by {median - budget_ms:.0f} ms")
+        return 1
+    return 0
+
+def print_report(report: dict):
+    latency = report["latency"]
+    print(f"Accounts: {report['accounts']} | Proxies: {report['proxies']} ({report['proxy_type']}) | "
+          f"Duration: {report['duration']}s (setup {report['setup_seconds']}s)")
+    print(f"Requests: {report['requests']} ({report['requests_per_second']}/s) | "
+          f"Success: {report['success_rate'] * 100:.1f}% | Retries: {report['retries']}")
+    print(f"Latency: p50 {latency['p50']}s p90 {latency['p90']}s p99 {latency['p99']}s mean {latency['mean']}s")
+    for name, endpoint in sorted(report["endpoints"].items()):
+        print(f"  {name}: {endpoint['requests']} requests, {endpoint['ok']} ok, "
+              f"p50 {endpoint['p50']}s p99 {endpoint['p99']}s")
+    print(f"Outcomes: {', '.join(f'{outcome}={count}' for outcome, count in report['outcomes'].items())}")
+    print(f"CPU: {report['cpu_seconds']}s ({report['cpu_percent']}%) | RSS: {report['rss_mb']} MB "
+          f"(peak {report['peak_rss_mb']} MB, {report['kb_per_account']} KB/account)")
+    print(f"Mock API: {report['mock']['api']}")
+    if report["mock"]["proxies"]:
+        print(f"Mock proxies: {report['mock']['proxies']}")
+
+def parse_args(argv=None) -> tuple[argparse.Namespace, list[str]]:
+    argv = sys.argv[1:] if argv is None else argv
+    bot_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, bot_args = argv[:split], argv[split + 1:]
+    parser = argparse.ArgumentParser(description="Offline load test against a local mock Dawn API")
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--proxies", type=int, default=50)
+    parser.add_argument("--proxy-type", choices=("http", "socks5", "none"), default="http")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to run, setup included")
+    parser.add_argument("--ping-interval", type=float, default=30)
+    parser.add_argument("--earning-interval", type=float, default=60)
+    parser.add_argument("--port", type=int, default=18900, help="mock API port; proxies take the ports after it")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="mean API response delay in seconds")
+    parser.add_argument("--api-error-rate", type=float, default=0.0, help="share of API requests answered with 500")
+    parser.add_argument("--api-429-rate", type=float, default=0.0, help="share of API requests answered with 429")
+    parser.add_argument("--api-drop-rate", type=float, default=0.0, help="share of API requests whose connection is dropped")
+    parser.add_argument("--proxy-latency", type=float, default=0.0, help="mean delay before a proxy opens its tunnel")
+    parser.add_argument("--proxy-error-rate", type=float, default=0.0, help="share of proxy connections refused")
+    parser.add_argument("--proxy-429-rate", type=float, default=0.0, help="share of proxy connections rate limited")
+    parser.add_argument("--proxy-drop-rate", type=float, default=0.0, help="share of proxy connections dropped")
+    parser.add_argument("--startup", action="store_true", help="measure cold start instead of running a load test")
+    parser.add_argument("--startup-runs", type=int, default=10)
+    parser.add_argument("--startup-budget", type=float, default=140, help="median cold start budget in milliseconds")
+    parser.add_argument("--bot-log", help="write the bot's log here instead of discarding it")
+    parser.add_argument("--json", help="also write the report as JSON to this file")
+    return parser.parse_args(argv), bot_args
+
+def main(argv=None) -> int:
+    options, bot_args = parse_args(argv)
+    if options.startup:
+        return measure_startup(options.startup_runs, options.startup_budget)
+    mock_options = {
+        "port": options.port,
+        "proxies": options.proxies,
+        "proxy_type": options.proxy_type,
+        "api_faults": {"latency": options.api_latency, "error_rate": options.api_error_rate,
+                       "rate_limit_rate": options.api_429_rate, "drop_rate": options.api_drop_rate},
+        "proxy_faults": {"latency": options.proxy_latency, "error_rate": options.proxy_error_rate,
+                         "rate_limit_rate": options.proxy_429_rate, "drop_rate": options.proxy_drop_rate},
+    }
+    context = multiprocessing.get_context("spawn")
+    ready, stop, results = context.Event(), context.Event(), context.Queue()
+    mock = context.Process(target=run_mock, args=(mock_options, ready, stop, results), daemon=True)
+    mock.start()
+    if not ready.wait(60):
+        print("Mock servers did not start", file=sys.stderr)
+        mock.terminate()
+        return 1
+    try:
+        with tempfile.TemporaryDirectory(prefix="dawn-bench-") as workdir:
+            report = asyncio.run(run_bot(options, bot_args, Path(workdir)))
+    finally:
+        stop.set()
+    report["mock"] = results.get(timeout=30)
+    mock.join(timeout=10)
+    print_report(report)
+    if options.json:
+        with open(options.json, "w") as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,99 @@
-import requests
-from fake_useragent import FakeUserAgent
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from colorama import *
-import asyncio, json, os, pytz, uuid
+import argparse, asyncio, hashlib, heapq, json, os, queue, random, shutil, signal, socket, sqlite3, sys, tempfile, threading, time, uuid
 import re
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from functools import cache, cached_property
+from itertools import islice
 from pathlib import Path
-from typing import Literal, TypedDict, Union
-from pydantic import BaseModel, Field, field_validator
-from pydantic.networks import HttpUrl, IPv4Address
-from requests.exceptions import ProxyError, SSLError
+from typing import TYPE_CHECKING, Literal, TypedDict
 
-wib = pytz.timezone('Asia/Jakarta')
+if TYPE_CHECKING:
+    from aiohttp import ClientResponseError, ClientSession, ClientTimeout
+
+# Asia/Jakarta has been a fixed UTC+7 without DST since 1964, so no tz database is needed
+wib = timezone(timedelta(hours=7), "WIB")
+
+ANSI_ESCAPE_REGEXP = re.compile(r"\x1b\[[0-9;]*m")
+LOG_LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+LOG_FORMATS = ("color", "plain", "json")
+# auto = the live dashboard when farming from the menu in a terminal, log lines otherwise
+UI_MODES = ("auto", "log", "dashboard")
+# fixed/adaptive poll earnings as their own job; keepalive/demand piggyback on a
+# successful ping (demand only after SIGUSR1)
+EARNING_MODES = ("fixed", "adaptive", "keepalive", "demand")
+
+# Bundled desktop Chrome user agents (the extension only runs in Chrome), so no
+# user agent database has to be loaded; see Dawn.load_user_agents for others
+CHROME_VERSIONS = ("124", "125", "126", "127", "128", "129", "130", "131", "132", "133", "134", "135")
+CHROME_PLATFORMS = ("Windows NT 10.0; Win64; x64", "Macintosh; Intel Mac OS X 10_15_7", "X11; Linux x86_64")
+USER_AGENTS = tuple(
+    f"Mozilla/5.0 ({platform}) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{version}.0.0.0 Safari/537.36"
+    for version in CHROME_VERSIONS for platform in CHROME_PLATFORMS
+)
+
+MONOSANS_PROXY_URL = "https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/all.txt"
+PROXY_MODES = {"monosans": 1, "private": 2, "none": 3}
+DEFAULT_SETTINGS = {
+    "headless": False,
+    "proxy_mode": "none",
+    "accounts_file": "accounts.json",
+    "accounts_db": None,
+    "proxy_file": "proxy.txt",
+    "workers": 200,
+    "max_concurrency": 500,
+    "per_proxy_concurrency": 10,
+    "per_proxy_rate": 5.0,
+    "per_host_rate": 0.0,
+    "session_limit": 100,
+    "max_sessions": 1000,
+    "session_idle_ttl": 300,
+    "max_accounts_per_proxy": 0,
+    "proxy_check_concurrency": 200,
+    "proxy_check_timeout": 10,
+    "proxy_check_interval": 5 * 60,
+    "ping_interval": 10 * 60,
+    "earning_interval": 10 * 60,
+    "earning_mode": "adaptive",
+    "earning_max_interval": 6 * 60 * 60,
+    "log_level": "info",
+    "log_format": "color",
+    "ui": "auto",
+    "dashboard_fps": 4,
+    "metrics_port": None,
+    "metrics_interval": 60,
+    "proxy_download": True,
+    "watch_interval": 5,
+    "shard_count": 1,
+    "shard_ids": None,
+    "status_dir": "shards",
+    "state_file": "state.json",
+    "state_interval": 60,
+    "base_api": "https://ext-api.dawninternet.com",
+    "user_agents": None,
+}
+
+STATE_VERSION = 2
+AUTH_ERROR_STATUSES = (401, 403)
+
+# aiohttp is most of the cold start, so it is imported where the bot first
+# talks to the network rather than at module level; the error groups are
+# built on first use for the same reason
+@cache
+def proxy_errors() -> tuple:
+    from aiohttp import ClientProxyConnectionError, ClientSSLError
+    from aiohttp_socks import ProxyError, ProxyConnectionError, ProxyTimeoutError
+    return (ProxyError, ProxyConnectionError, ProxyTimeoutError, ClientProxyConnectionError, ClientSSLError)
+
+@cache
+def connect_errors() -> tuple:
+    from aiohttp import ClientConnectorError, ClientOSError, ClientPayloadError, ServerDisconnectedError
+    # ClientOSError covers resets after connecting, ClientPayloadError a body cut off mid-way
+    return proxy_errors() + (
+        ClientConnectorError, ClientOSError, ClientPayloadError, ServerDisconnectedError, asyncio.TimeoutError
+    )
 
 # Proxy parsing logic
 Protocol = Literal["http", "https", "socks4", "socks5"]
@@ -41,6 +124,15 @@ PROXY_FORMATS_REGEXP = [
     ),
 ]
 
+# Fast path for the common "[protocol://][login:password@]host:port" shape;
+# anything else falls back to PROXY_FORMATS_REGEXP
+PROXY_FAST_REGEXP = re.compile(
+    r"^(?:(?P<protocol>[A-Za-z0-9]+)://)?"
+    r"(?:(?P<login>[^@:\s]+):(?P<password>[^@\s]+)@)?"
+    r"(?P<host>[^@:\s/]+):(?P<port>\d{1,5})$"
+)
+PROTOCOLS = ("http", "https", "socks4", "socks5")
+
 class ParsedProxy(TypedDict):
     host: str
     port: int
@@ -66,79 +158,1618 @@ def parse_proxy_str(proxy: str) -> ParsedProxy:
             }
     raise ValueError(f"Unsupported proxy format: '{proxy}'")
 
-def _load_lines(filepath: Path | str) -> list[str]:
-    with open(filepath, "r") as file:
-        return [line.strip() for line in file.readlines() if line.strip()]
+class ProxyRecord:
+    # Lightweight stand-in for proxy_model.Proxy used for bulk lists: parsed with one regex
+    # per line in the common case, validated with pydantic only on request.
+    # Records are immutable once built, so the URL is computed exactly once.
+    __slots__ = ("host", "port", "protocol", "login", "password", "refresh_url", "url")
 
-class Proxy(BaseModel):
-    host: str
-    port: int = Field(gt=0, le=65535)
-    protocol: Protocol = "http"
-    login: str | None = None
-    password: str | None = None
-    refresh_url: str | None = None
-
-    @field_validator("host")
-    def host_validator(cls, v):
-        if v.replace(".", "").isdigit():
-            IPv4Address(v)
+    def __init__(self, host: str, port: int, protocol: Protocol = "http", login: str | None = None,
+                 password: str | None = None, refresh_url: str | None = None):
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.login = login
+        self.password = password
+        self.refresh_url = refresh_url
+        self.url = (
+            f"{protocol}://"
+            + (f"{login}:{password}@" if login and password else "")
+            + f"{host}:{port}"
+        )
+
+    @staticmethod
+    def parse(line: str) -> tuple:
+        match = PROXY_FAST_REGEXP.match(line)
+        if match:
+            protocol, login, password, host, port = match.groups()
+            refresh_url = None
         else:
-            HttpUrl(f"http://{v}")
-        return v
-
-    @field_validator("refresh_url")
-    def refresh_url_validator(cls, v):
-        if v:
-            HttpUrl(v)
-        return v
-
-    @field_validator("protocol")
-    def protocol_validator(cls, v):
-        if v not in ["http", "https", "socks4", "socks5"]:
+            groups = parse_proxy_str(line)
+            protocol, login, password = groups["protocol"], groups["login"], groups["password"]
+            host, port, refresh_url = groups["host"], groups["port"], groups["refresh_url"]
+        protocol = protocol.lower() if protocol else "http"
+        if protocol not in PROTOCOLS:
             raise ValueError("Only http, https, socks4, and socks5 protocols are supported")
-        return v
+        port = int(port)
+        if not 0 < port <= 65535:
+            raise ValueError(f"Invalid port: {port}")
+        # Force http for https proxies to avoid SSL issues, keep socks intact
+        if protocol == "https":
+            protocol = "http"
+        return host, port, protocol, login, password, refresh_url
 
     @classmethod
-    def from_str(cls, proxy: Union[str, "Proxy"]) -> "Proxy":
-        if proxy is None:
-            raise ValueError("Proxy cannot be None")
-        if isinstance(proxy, cls):
-            return proxy
-        parsed_proxy = parse_proxy_str(proxy)
-        parsed_proxy["protocol"] = parsed_proxy["protocol"] or "http"
-        return cls(**parsed_proxy)
+    def from_str(cls, line: str) -> "ProxyRecord":
+        return cls(*cls.parse(line))
 
     @classmethod
-    def from_file(cls, filepath: Path | str) -> list["Proxy"]:
+    def from_file(cls, filepath: Path | str, validate: bool = False) -> tuple[list["ProxyRecord"], int]:
         path = Path(filepath)
         if not path.exists():
             raise FileNotFoundError(f"Proxy file not found: {filepath}")
-        proxies = []
-        for proxy in _load_lines(path):
-            try:
-                proxy_obj = cls.from_str(proxy)
-                # Force http for https proxies to avoid SSL issues, keep socks intact
-                if proxy_obj.protocol == "https":
-                    proxy_obj.protocol = "http"
-                proxies.append(proxy_obj)
-            except ValueError as e:
-                print(f"{Fore.RED + Style.BRIGHT}✗ Invalid proxy format: {proxy} ({e}){Style.RESET_ALL}")
-        return proxies
+        records = []
+        seen = set()
+        invalid = 0
+        parse = cls.parse
+        with open(path, "r", errors="replace") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    fields = parse(line)
+                except ValueError:
+                    invalid += 1
+                    continue
+                # Dedup on host:port before building a record at all
+                key = (fields[0], fields[1])
+                if key in seen:
+                    continue
+                record = cls(*fields)
+                if validate:
+                    try:
+                        record.validate()
+                    except ValueError:
+                        invalid += 1
+                        continue
+                seen.add(key)
+                records.append(record)
+        return records, invalid
+
+    def validate(self) -> "ProxyRecord":
+        from proxy_model import Proxy
+        Proxy(
+            host=self.host, port=self.port, protocol=self.protocol, login=self.login,
+            password=self.password, refresh_url=self.refresh_url
+        )
+        return self
 
     @property
     def as_url(self) -> str:
+        return self.url
+
+class RequestTemplate:
+    # The parts of an account's requests that only change with its token or app
+    # id, built once so the ping path reuses them. Headers shared by every
+    # account are session defaults (see SessionPool), so only the bearer token
+    # and the account's user agent are added per request. A new token means a
+    # new template (see Dawn.request_template), so the headers are built once.
+    __slots__ = ("app_id", "token", "headers", "getpoint_url", "keepalive_url", "keepalive_body")
+
+    def __init__(self, base_api: str, app_id: str, email: str, token: str, user_agent: str):
+        self.app_id = app_id
+        self.token = token
+        self.headers = {"Authorization": f"Bearer {token}", "User-Agent": user_agent}
+        self.getpoint_url = f"{base_api}/api/atom/v1/userreferral/getpoint?appid={app_id}"
+        self.keepalive_url = f"{base_api}/chromeapi/dawn/v1/userreward/keepalive?appid={app_id}"
+        self.keepalive_body = json.dumps(
+            {"username": email, "extensionid": "fpdkjdnhkakefebpekbdhillbhonfjjp", "numberoftabs": 0, "_v": "1.1.6"}
+        ).encode()
+
+class AccountState:
+    # Runtime state of a running account, slotted since there is one per account.
+    # Everything but the token, request template and dashboard status is what
+    # the state snapshot carries across restarts.
+    __slots__ = ("token", "app_id", "last_ping", "last_earning", "points", "earning_every", "next_earning",
+                 "token_valid", "template", "status", "failures")
+
+    def __init__(self, token: str, app_id: str, last_ping: float = 0.0,
+                 last_earning: float = 0.0, points: float | None = None):
+        self.token = token
+        self.app_id = app_id
+        self.last_ping = last_ping
+        self.last_earning = last_earning
+        self.points = points
+        self.earning_every = 0.0
+        self.next_earning = 0.0
+        # None until the API has answered; False quarantines the account
+        self.token_valid: bool | None = None
+        self.template: RequestTemplate | None = None
+        # Level of the account's last event and failed events in a row
+        self.status: str | None = None
+        self.failures = 0
+
+    @staticmethod
+    def fingerprint(token: str) -> str:
+        return hashlib.blake2b(token.encode(), digest_size=8).hexdigest()
+
+class PointExtractor:
+    # Sums the numeric "*points*" fields of a getpoint response. Which keys match
+    # is worked out once per distinct rewardPoint layout and reused after that.
+    def __init__(self, max_layouts: int = 64):
+        self.max_layouts = max_layouts
+        self.layouts: dict[tuple, tuple] = {}
+
+    def keys_for(self, reward_point: dict) -> tuple:
+        layout = tuple(reward_point)
+        keys = self.layouts.get(layout)
+        if keys is None:
+            if len(self.layouts) >= self.max_layouts:
+                self.layouts.clear()
+            keys = self.layouts[layout] = tuple(key for key in layout if "points" in key.lower())
+        return keys
+
+    def total(self, user: dict) -> float:
+        referral_point = (user.get("referralPoint") or {}).get("commission") or 0
+        reward_point = user.get("rewardPoint") or {}
+        total = referral_point if isinstance(referral_point, (int, float)) else 0
+        for key in self.keys_for(reward_point):
+            value = reward_point[key]
+            if isinstance(value, (int, float)):
+                total += value
+        return total
+
+class SessionPool:
+    # One ClientSession per proxy URL (None = direct), so every account and loop
+    # sharing a proxy reuses the same warm keep-alive connections.
+    def __init__(self, timeout: float = 30, connect_timeout: float = 10, limit: int = 100, limit_per_host: int = 0,
+                 max_sessions: int = 1000, idle_ttl: float = 300, keepalive_timeout: float = 60, headers: dict | None = None):
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.headers = headers
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.sessions: dict[str | None, ClientSession] = {}
+        self.last_used: dict[str | None, float] = {}
+        self.in_use: dict[str | None, int] = {}
+        # Closes started by eviction, kept so they are not collected mid-close
+        self._closing: set[asyncio.Task] = set()
+        self._evict_task = None
+
+    @cached_property
+    def client_timeout(self) -> "ClientTimeout":
+        from aiohttp import ClientTimeout
+        return ClientTimeout(total=self.timeout, sock_connect=self.connect_timeout)
+
+    def _connector(self, proxy=None):
+        from aiohttp import TCPConnector
+        from aiohttp_socks import ProxyConnector
+        options = {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "keepalive_timeout": self.keepalive_timeout,
+            "ttl_dns_cache": 300,
+        }
+        if proxy:
+            return ProxyConnector.from_url(proxy.as_url, **options)
+        return TCPConnector(**options)
+
+    def _session(self, key, proxy=None) -> "ClientSession":
+        session = self.sessions.get(key)
+        if session is None or session.closed:
+            from aiohttp import ClientSession
+            if len(self.sessions) >= self.max_sessions:
+                self._evict_lru()
+            session = ClientSession(connector=self._connector(proxy), timeout=self.client_timeout, headers=self.headers)
+            self.sessions[key] = session
+        if self._evict_task is None or self._evict_task.done():
+            self._evict_task = asyncio.create_task(self._evict_idle_loop())
+        return session
+
+    @asynccontextmanager
+    async def acquire(self, proxy=None):
+        key = proxy.as_url if proxy else None
+        session = self._session(key, proxy)
+        self.in_use[key] = self.in_use.get(key, 0) + 1
+        try:
+            yield session
+        finally:
+            # The session may have been discarded (and its key reused) meanwhile
+            if self.sessions.get(key) is session:
+                self.in_use[key] -= 1
+                self.last_used[key] = time.monotonic()
+
+    def _discard(self, key):
+        session = self.sessions.pop(key, None)
+        self.last_used.pop(key, None)
+        self.in_use.pop(key, None)
+        if session and not session.closed:
+            task = asyncio.create_task(session.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    def _evict_lru(self):
+        idle = [key for key in self.sessions if not self.in_use.get(key)]
+        if idle:
+            self._discard(min(idle, key=lambda key: self.last_used.get(key, 0)))
+
+    async def _evict_idle_loop(self):
+        while self.sessions:
+            await asyncio.sleep(self.idle_ttl / 2)
+            deadline = time.monotonic() - self.idle_ttl
+            for key in list(self.sessions):
+                if not self.in_use.get(key) and self.last_used.get(key, 0) < deadline:
+                    self._discard(key)
+
+    async def close(self, drain_timeout: float = 5):
+        if self._evict_task:
+            self._evict_task.cancel()
+            self._evict_task = None
+        # Requests still holding a session get a moment to finish first
+        deadline = time.monotonic() + drain_timeout
+        while any(self.in_use.values()) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        sessions = list(self.sessions.values())
+        self.sessions.clear()
+        self.last_used.clear()
+        self.in_use.clear()
+        await asyncio.gather(
+            *(session.close() for session in sessions if not session.closed), *self._closing,
+            return_exceptions=True
+        )
+
+class ProxyStats:
+    __slots__ = ("latency", "success", "alive", "checked_at")
+
+    def __init__(self):
+        self.latency = None
+        self.success = 1.0
+        self.alive = True
+        self.checked_at = 0.0
+
+    def record(self, ok: bool, latency: float | None = None):
+        # Exponentially weighted so recent probes dominate the ranking
+        self.success = self.success * 0.8 + (0.2 if ok else 0.0)
+        if ok and latency is not None:
+            self.latency = latency if self.latency is None else self.latency * 0.7 + latency * 0.3
+        self.checked_at = time.monotonic()
+
+    @property
+    def score(self) -> float:
+        latency = self.latency if self.latency is not None else 10.0
+        return latency / max(self.success, 0.01)
+
+class CircuitBreaker:
+    # Opens after `threshold` consecutive failures. Once `cooldown` has passed it
+    # half-opens and lets a single trial request through; the trial's outcome
+    # closes it again or re-opens it for another cooldown.
+    __slots__ = ("threshold", "cooldown", "failures", "opened_at", "trial")
+
+    def __init__(self, threshold: int = 3, cooldown: float = 60):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.trial:
+            self.trial = True
+            return True
+        return False
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def failure(self):
+        self.failures += 1
+        if self.trial or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            self.trial = False
+
+class ProxyPool:
+    # Probes every proxy concurrently and keeps the live ones ranked by
+    # latency and success rate. Real request outcomes feed the same stats
+    # and drive a circuit breaker per proxy.
+    def __init__(self, proxies: list, check_url: str, concurrency: int = 200, timeout: float = 10,
+                 interval: float = 300, breaker_threshold: int = 3, breaker_cooldown: float = 60):
+        self.proxies = proxies
+        self.check_url = check_url
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.interval = interval
+        self.stats: dict[str, ProxyStats] = {proxy.as_url: ProxyStats() for proxy in proxies}
+        self.breakers: dict[str, CircuitBreaker] = {
+            proxy.as_url: CircuitBreaker(breaker_threshold, breaker_cooldown) for proxy in proxies
+        }
+        self.ranked: list = list(proxies)
+
+    def is_alive(self, proxy) -> bool:
+        stats = self.stats.get(proxy.as_url)
+        return stats is not None and stats.alive and self.breakers[proxy.as_url].state != "open"
+
+    def allow(self, proxy) -> bool:
+        breaker = self.breakers.get(proxy.as_url)
+        return breaker is not None and breaker.allow()
+
+    def record(self, proxy, ok: bool, latency: float | None = None):
+        stats = self.stats.get(proxy.as_url)
+        if stats:
+            stats.record(ok, latency)
+            breaker = self.breakers[proxy.as_url]
+            breaker.success() if ok else breaker.failure()
+
+    def rerank(self):
+        alive = [proxy for proxy in self.proxies if self.is_alive(proxy)]
+        alive.sort(key=lambda proxy: self.stats[proxy.as_url].score)
+        self.ranked = alive
+
+    async def check(self, proxy, semaphore: asyncio.Semaphore):
+        from aiohttp import ClientSession, ClientTimeout
+        from aiohttp_socks import ProxyConnector
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                connector = ProxyConnector.from_url(proxy.as_url, force_close=True)
+                async with ClientSession(connector=connector, timeout=ClientTimeout(total=self.timeout)) as session:
+                    async with session.get(self.check_url, allow_redirects=False) as response:
+                        await response.read()
+                # Any HTTP answer from the API host means the tunnel works
+                self.record(proxy, True, time.monotonic() - started)
+                self.stats[proxy.as_url].alive = True
+            except Exception:
+                # A failed probe takes the proxy out of rotation until it passes again
+                self.record(proxy, False)
+                self.stats[proxy.as_url].alive = False
+
+    async def check_all(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self.check(proxy, semaphore) for proxy in self.proxies))
+        self.rerank()
+
+    def inherit(self, other: "ProxyPool"):
+        # Keep the health history of proxies that survive a list reload
+        for url, stats in other.stats.items():
+            if url in self.stats:
+                self.stats[url] = stats
+                self.breakers[url] = other.breakers[url]
+
+class ProxyAssigner:
+    # Accounts per proxy kept in load buckets (load -> ordered set of proxy URLs),
+    # so the least-loaded proxy is found without scanning the proxy list, and
+    # evicting a proxy hands back exactly the accounts that were on it.
+    def __init__(self, max_accounts_per_proxy: int = 0):
+        self.max_accounts = max_accounts_per_proxy
+        self.proxies: dict[str, object] = {}
+        self.load: dict[str, int] = {}
+        self.buckets: dict[int, OrderedDict] = {}
+        self.accounts: dict[str, set] = {}
+        self.assigned: dict[str, str] = {}
+        self.min_load = 0
+
+    def __len__(self) -> int:
+        return len(self.proxies)
+
+    def __contains__(self, proxy) -> bool:
+        return proxy.as_url in self.proxies
+
+    def _bucket_add(self, key: str, load: int):
+        self.buckets.setdefault(load, OrderedDict())[key] = None
+        if load < self.min_load or len(self.buckets) == 1:
+            self.min_load = load
+
+    def _bucket_remove(self, key: str, load: int):
+        bucket = self.buckets[load]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[load]
+            if load == self.min_load:
+                # Distinct load levels stay few, so this is cheap in practice
+                self.min_load = min(self.buckets, default=0)
+
+    def _move(self, key: str, delta: int):
+        load = self.load[key]
+        self._bucket_remove(key, load)
+        self.load[key] = load + delta
+        self._bucket_add(key, load + delta)
+
+    def add(self, proxy):
+        key = proxy.as_url
+        if key in self.proxies:
+            return
+        self.proxies[key] = proxy
+        self.load[key] = 0
+        self.accounts[key] = set()
+        self._bucket_add(key, 0)
+
+    def remove(self, proxy) -> list[str]:
+        key = proxy.as_url
+        if key not in self.proxies:
+            return []
+        self._bucket_remove(key, self.load.pop(key))
+        del self.proxies[key]
+        orphans = list(self.accounts.pop(key))
+        for email in orphans:
+            del self.assigned[email]
+        return orphans
+
+    def proxy_for(self, email: str):
+        key = self.assigned.get(email)
+        return self.proxies[key] if key else None
+
+    def least_loaded(self, exclude=None):
+        if not self.buckets:
+            return None
+        load = self.min_load
+        candidates = islice(self.buckets[load], 2)
+        key = next(candidates)
+        if exclude and key == exclude.as_url:
+            key = next(candidates, None)
+            if key is None:
+                higher = [level for level in self.buckets if level > load]
+                if not higher:
+                    return None
+                load = min(higher)
+                key = next(iter(self.buckets[load]))
+        if self.max_accounts and load >= self.max_accounts:
+            return None
+        return self.proxies[key]
+
+    def release(self, email: str):
+        key = self.assigned.pop(email, None)
+        if key:
+            self.accounts[key].discard(email)
+            self._move(key, -1)
+
+    def bind(self, email: str, key: str):
+        # Pins an account to a known proxy (e.g. its binding before a restart)
+        # unless that proxy is gone or already at capacity
+        if key not in self.proxies:
+            return None
+        if self.assigned.get(email) == key:
+            return self.proxies[key]
+        if self.max_accounts and self.load[key] >= self.max_accounts:
+            return None
+        self.release(email)
+        self.assigned[email] = key
+        self.accounts[key].add(email)
+        self._move(key, 1)
+        return self.proxies[key]
+
+    def assign(self, email: str, exclude=None):
+        proxy = self.least_loaded(exclude) or (self.least_loaded() if exclude else None)
+        if proxy is None:
+            # Sticky: with every proxy at capacity the account keeps what it has
+            return self.proxy_for(email)
+        self.release(email)
+        key = proxy.as_url
+        self.assigned[email] = key
+        self.accounts[key].add(email)
+        self._move(key, 1)
+        return proxy
+
+class RetryPolicy:
+    # Exponential backoff with jitter for server-side failures. Connection and
+    # proxy errors are not delayed here; the caller fails over instead.
+    def __init__(self, retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0, jitter: float = 0.5):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def is_retryable(self, status: int) -> bool:
+        return status == 429 or status >= 500
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = random.uniform(delay * (1 - self.jitter), delay)
+        return max(delay, retry_after or 0)
+
+    @staticmethod
+    def retry_after(error: "ClientResponseError") -> float | None:
+        value = (error.headers or {}).get("Retry-After")
+        try:
+            return float(value) if value else None
+        except ValueError:
+            return None
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def take(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class RequestLimiter:
+    # Global and per-proxy concurrency caps plus per-proxy and per-host token
+    # buckets. A rate or cap of 0 disables that limit. Direct (no proxy)
+    # requests are only subject to the global and per-host limits.
+    def __init__(self, max_concurrency: int = 500, per_proxy_concurrency: int = 10,
+                 per_proxy_rate: float = 5.0, per_host_rate: float = 0.0):
+        self.max_concurrency = max_concurrency
+        self.per_proxy_concurrency = per_proxy_concurrency
+        self.per_proxy_rate = per_proxy_rate
+        self.per_host_rate = per_host_rate
+        self.global_slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.proxy_slots: dict[str, asyncio.Semaphore] = {}
+        self.proxy_buckets: dict[str, TokenBucket] = {}
+        self.host_buckets: dict[str, TokenBucket] = {}
+
+    def _proxy_slot(self, key: str) -> asyncio.Semaphore | None:
+        if not self.per_proxy_concurrency:
+            return None
+        if key not in self.proxy_slots:
+            self.proxy_slots[key] = asyncio.Semaphore(self.per_proxy_concurrency)
+        return self.proxy_slots[key]
+
+    async def _take(self, buckets: dict, key: str, rate: float):
+        if not rate:
+            return
+        if key not in buckets:
+            buckets[key] = TokenBucket(rate)
+        await buckets[key].take()
+
+    @asynccontextmanager
+    async def slot(self, proxy=None, host: str = ""):
+        # Per-proxy limits are taken before the global slot so a slow proxy
+        # queues its own requests without holding global capacity.
+        proxy_slot = self._proxy_slot(proxy.as_url) if proxy else None
+        if proxy_slot:
+            await proxy_slot.acquire()
+        try:
+            if proxy:
+                await self._take(self.proxy_buckets, proxy.as_url, self.per_proxy_rate)
+            await self._take(self.host_buckets, host, self.per_host_rate)
+            if self.global_slots:
+                async with self.global_slots:
+                    yield
+            else:
+                yield
+        finally:
+            if proxy_slot:
+                proxy_slot.release()
+
+class ScheduledJob:
+    __slots__ = ("func", "interval", "seq")
+
+    def __init__(self, func, interval: float, seq: int):
+        self.func = func
+        self.interval = interval
+        self.seq = seq
+
+class Scheduler:
+    # Single heap of next-due times for every (job, account) pair. Due jobs are
+    # handed to a fixed worker pool instead of one sleeping task per loop, and
+    # each job's func is awaited with its key, so one function serves them all.
+    def __init__(self, workers: int = 200, jitter: float = 0.1, on_error=None):
+        self.workers = workers
+        self.jitter = jitter
+        self.on_error = on_error
+        self.jobs: dict[object, ScheduledJob] = {}
+        self.heap: list[tuple[float, int, object]] = []
+        self.queue: asyncio.Queue | None = None
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+
+    def _push(self, key, job: ScheduledJob, due: float):
+        self._seq += 1
+        job.seq = self._seq
+        heapq.heappush(self.heap, (due, job.seq, key))
+        if self.heap[0][2] == key:
+            self._wakeup.set()
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter) if seconds > 0 else 0
+
+    def add(self, key, func, interval: float, delay: float = 0):
+        job = ScheduledJob(func, interval, 0)
+        self.jobs[key] = job
+        self._push(key, job, time.monotonic() + self._jittered(delay))
+
+    def remove(self, key):
+        # Heap entries are dropped lazily when they come due
+        self.jobs.pop(key, None)
+
+    def set_interval(self, key, interval: float):
+        # Takes effect from the job's next run
+        job = self.jobs.get(key)
+        if job:
+            job.interval = interval
+
+    def reschedule(self, key, delay: float = 0):
+        job = self.jobs.get(key)
+        if job:
+            self._push(key, job, time.monotonic() + delay)
+
+    async def _dispatch(self):
+        while True:
+            self._wakeup.clear()
+            if not self.heap:
+                await self._wakeup.wait()
+                continue
+            due, seq, key = self.heap[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self.heap)
+            job = self.jobs.get(key)
+            if job is None or job.seq != seq:
+                continue
+            await self.queue.put((key, job))
+
+    async def _worker(self):
+        while True:
+            key, job = await self.queue.get()
+            started = time.monotonic()
+            try:
+                await job.func(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(key, e)
+            if self.jobs.get(key) is job:
+                self._push(key, job, started + self._jittered(job.interval))
+
+    async def run(self):
+        self.queue = asyncio.Queue(maxsize=self.workers)
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        try:
+            await self._dispatch()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        # Linear interpolation inside the bucket that holds the q-th observation
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1] * 2
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return LATENCY_BUCKETS[-1]
+
+class RequestStats:
+    __slots__ = ("outcomes", "retries", "in_flight", "latency")
+
+    def __init__(self):
+        self.outcomes: dict[str, int] = {}
+        self.retries = 0
+        self.in_flight = 0
+        self.latency = Histogram()
+
+    @property
+    def requests(self) -> int:
+        return sum(self.outcomes.values())
+
+    @property
+    def success_rate(self) -> float | None:
+        total = self.requests
+        return self.outcomes.get("ok", 0) / total if total else None
+
+class Metrics:
+    # Request counters, outcomes by error class, retries, in-flight gauges and
+    # latency histograms, kept globally, per endpoint and per proxy.
+    def __init__(self):
+        self.stats: dict[tuple[str, str], RequestStats] = {}
+        self.started = time.monotonic()
+        self._last_summary = (self.started, 0)
+
+    def _get(self, scope: str, name: str) -> RequestStats:
+        key = (scope, name)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = RequestStats()
+        return stats
+
+    def _targets(self, endpoint: str, proxy=None) -> tuple:
         return (
-            f"{self.protocol}://"
-            + (f"{self.login}:{self.password}@" if self.login and self.password else "")
-            + f"{self.host}:{self.port}"
+            self._get("global", ""),
+            self._get("endpoint", endpoint),
+            # Labels leave out proxy credentials since the endpoint is scrapeable
+            self._get("proxy", f"{proxy.protocol}://{proxy.host}:{proxy.port}" if proxy else "direct"),
         )
 
+    @staticmethod
+    def classify(error: BaseException) -> str:
+        from aiohttp import ClientResponseError
+        if isinstance(error, ClientResponseError):
+            if error.status == 429:
+                return "http_429"
+            if error.status in AUTH_ERROR_STATUSES:
+                return f"http_{error.status}"
+            return "http_5xx" if error.status >= 500 else "http_4xx"
+        if isinstance(error, proxy_errors()):
+            return "proxy_error"
+        if isinstance(error, asyncio.TimeoutError):
+            return "timeout"
+        if isinstance(error, connect_errors()):
+            return "connect_error"
+        if isinstance(error, asyncio.CancelledError):
+            return "cancelled"
+        return "error"
+
+    def begin(self, endpoint: str, proxy=None) -> tuple:
+        targets = self._targets(endpoint, proxy)
+        for stats in targets:
+            stats.in_flight += 1
+        return targets
+
+    def end(self, targets: tuple, outcome: str, latency: float):
+        for stats in targets:
+            stats.in_flight -= 1
+            stats.outcomes[outcome] = stats.outcomes.get(outcome, 0) + 1
+            # Failures (timeouts especially) would skew the percentiles, so only
+            # successful requests are timed
+            if outcome == "ok":
+                stats.latency.observe(latency)
+
+    def retry(self, endpoint: str, proxy=None):
+        for stats in self._targets(endpoint, proxy):
+            stats.retries += 1
+
+    def render_prometheus(self) -> str:
+        # The exposition format wants each family's samples together under its
+        # HELP/TYPE lines, so families are written one after another
+        entries = [(f'scope="{scope}",name="{name}"', stats) for (scope, name), stats in list(self.stats.items())]
+        lines = [
+            "# HELP dawn_requests_total Requests by outcome.",
+            "# TYPE dawn_requests_total counter",
+        ]
+        for labels, stats in entries:
+            for outcome, count in stats.outcomes.items():
+                lines.append(f'dawn_requests_total{{{labels},outcome="{outcome}"}} {count}')
+        lines += ["# HELP dawn_retries_total Retried request attempts.", "# TYPE dawn_retries_total counter"]
+        lines += [f"dawn_retries_total{{{labels}}} {stats.retries}" for labels, stats in entries]
+        lines += ["# HELP dawn_in_flight Requests in flight.", "# TYPE dawn_in_flight gauge"]
+        lines += [f"dawn_in_flight{{{labels}}} {stats.in_flight}" for labels, stats in entries]
+        lines += [
+            "# HELP dawn_request_seconds Latency of successful requests.",
+            "# TYPE dawn_request_seconds histogram",
+        ]
+        for labels, stats in entries:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.latency.counts):
+                cumulative += count
+                lines.append(f'dawn_request_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"dawn_request_seconds_sum{{{labels}}} {stats.latency.total:.6f}")
+            lines.append(f"dawn_request_seconds_count{{{labels}}} {stats.latency.count}")
+        return "\n".join(lines) + "\n"
+
+    def slowest_proxies(self, limit: int = 3) -> list[tuple[str, float]]:
+        latencies = [
+            (name, stats.latency.quantile(0.5)) for (scope, name), stats in self.stats.items()
+            if scope == "proxy" and stats.latency.count
+        ]
+        return sorted(latencies, key=lambda item: item[1], reverse=True)[:limit]
+
+    def summary(self) -> str:
+        stats = self._get("global", "")
+        now = time.monotonic()
+        last_time, last_requests = self._last_summary
+        requests = stats.requests
+        self._last_summary = (now, requests)
+        per_minute = (requests - last_requests) * 60 / max(now - last_time, 1e-6)
+        success_rate = stats.success_rate
+        p50, p99 = stats.latency.quantile(0.5), stats.latency.quantile(0.99)
+        errors = ", ".join(f"{outcome}={count}" for outcome, count in sorted(stats.outcomes.items()) if outcome != "ok")
+        slowest = ", ".join(f"{url} {latency:.2f}s" for url, latency in self.slowest_proxies())
+        return (
+            f"Requests: {requests} ({per_minute:.0f}/min) | "
+            f"Success: {success_rate * 100 if success_rate is not None else 0:.1f}% | "
+            f"p50: {p50 or 0:.2f}s p99: {p99 or 0:.2f}s | "
+            f"In flight: {stats.in_flight} | Retries: {stats.retries}"
+            + (f" | Errors: {errors}" if errors else "")
+            + (f" | Slowest proxies: {slowest}" if slowest else "")
+        )
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 9108):
+        from aiohttp import web
+        async def handle(request):
+            return web.Response(text=self.render_prometheus(), content_type="text/plain")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+
+class LogSink:
+    # Log records are queued by the event loop and formatted/written by a
+    # background thread in batches. Until start() (and after stop()) records
+    # are written inline, which keeps the interactive menus in order.
+    def __init__(self, stream=None, level: str = "info", fmt: str = "color",
+                 batch_size: int = 500, flush_interval: float = 0.2):
+        self.stream = stream or sys.stdout
+        self.level = level
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.tag = None
+        self.queue = queue.SimpleQueue()
+        self.thread = None
+        self._stamp_second = None
+        self._stamp = ""
+
     @property
-    def as_proxies_dict(self) -> dict:
-        proxies = {}
-        proxies["http"] = self.as_url
-        proxies["https"] = self.as_url
-        return proxies
+    def level(self) -> str:
+        return self._level_name
+
+    @level.setter
+    def level(self, value: str):
+        if value not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level: {value}")
+        self._level_name = value
+        self._level = LOG_LEVELS[value]
+
+    @property
+    def fmt(self) -> str:
+        return self._fmt
+
+    @fmt.setter
+    def fmt(self, value: str):
+        if value not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format: {value}")
+        self._fmt = value
+
+    def enabled(self, level: str) -> bool:
+        return LOG_LEVELS[level] >= self._level
+
+    def emit(self, level: str, message: str, color: str | None = None, account: str | None = None, proxy: str | None = None):
+        if LOG_LEVELS[level] < self._level:
+            return
+        record = (time.time(), level, message, color, account, proxy)
+        if self.thread:
+            self.queue.put(record)
+        else:
+            self._write([record])
+
+    def timestamp(self, now: float) -> str:
+        # Formatted at most once per second no matter how many records share it
+        second = int(now)
+        if second != self._stamp_second:
+            self._stamp_second = second
+            self._stamp = datetime.fromtimestamp(second, wib).strftime('%x %X %Z')
+        return self._stamp
+
+    def format(self, record: tuple) -> str:
+        now, level, message, color, account, proxy = record
+        if self._fmt == "json":
+            entry = {"time": now, "level": level, "message": ANSI_ESCAPE_REGEXP.sub("", message)}
+            if self.tag:
+                entry["tag"] = self.tag
+            if account is not None:
+                entry["account"] = account
+                entry["proxy"] = proxy
+            return json.dumps(entry, ensure_ascii=False) + "\n"
+        if self._fmt == "plain":
+            context = f"[{self.tag}] " if self.tag else ""
+            context += f"account={account} proxy={proxy} " if account is not None else ""
+            return f"{self.timestamp(now)} {level.upper()} {context}{ANSI_ESCAPE_REGEXP.sub('', message)}\n"
+        if account is not None:
+            message = (
+                f"{Fore.MAGENTA + Style.BRIGHT}Account:{Style.RESET_ALL} "
+                f"{Fore.CYAN + Style.BRIGHT}{account}{Style.RESET_ALL} | "
+                f"{Fore.MAGENTA + Style.BRIGHT}Proxy:{Style.RESET_ALL} "
+                f"{Fore.CYAN + Style.BRIGHT}{proxy}{Style.RESET_ALL}\n"
+                f"{Fore.MAGENTA + Style.BRIGHT}Status:{Style.RESET_ALL} "
+                f"{(color or '') + Style.BRIGHT}{message}{Style.RESET_ALL}"
+            )
+        tag = f"[{self.tag}]" if self.tag else ""
+        return (
+            f"{Fore.CYAN + Style.BRIGHT}╭─[{self.timestamp(now)}]{tag}{Style.RESET_ALL}\n"
+            f"{Fore.CYAN + Style.BRIGHT}╰──▶{Style.RESET_ALL} {message}\n"
+        )
+
+    def _write(self, records: list):
+        try:
+            self.stream.write("".join(self.format(record) for record in records))
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    record = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if record is None:
+                    self._write(batch)
+                    return
+                batch.append(record)
+            self._write(batch)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+class Dashboard:
+    # Live status table for farming in a terminal. Account events only update
+    # the account's row state; a frame task redraws the cells that changed since
+    # the last frame at a fixed rate, so terminal output no longer grows with
+    # the event rate. Frames never walk every account or proxy: failing
+    # accounts sit in buckets by failure count, kept up to date per event, and
+    # the slowest proxies are ranked by the periodic totals pass.
+    VIEWS = ("failing", "recent", "proxies")
+    VIEW_TITLES = {"failing": "Failing first", "recent": "Recently updated", "proxies": "Slowest proxies"}
+    VIEW_EMPTY = {"failing": "No failing accounts", "recent": "No events yet", "proxies": "No proxies in use"}
+    ACCOUNT_COLUMNS = (("Account", 24), ("Status", 9), ("Fails", 5), ("Last ping", 9), ("Points", 12),
+                       ("Proxy", 26), ("Message", 0))
+    PROXY_COLUMNS = (("Proxy", 32), ("State", 9), ("Latency", 8), ("Success", 8), ("p50", 7), ("p99", 7),
+                     ("Requests", 9), ("Errors", 7), ("Accounts", 8))
+    STATUSES = {
+        "info": ("✓ OK", Fore.GREEN), "warning": ("! Warn", Fore.YELLOW),
+        "error": ("✗ Error", Fore.RED), None: ("… Wait", Fore.WHITE),
+    }
+    # Accounts that reported last, kept with their last message
+    RECENT_LIMIT = 1000
+    # Failing accounts tracked for the failing view; counts past FAILURE_LEVELS
+    # rank together, which bounds the buckets a frame walks
+    FAILING_LIMIT = 1000
+    FAILURE_LEVELS = 100
+    PROXY_LIMIT = 200
+    TOTALS_INTERVAL = 2
+    NOTES = 3
+
+    def __init__(self, bot: "Dawn", fps: float = 4, stream=None):
+        self.bot = bot
+        self.fps = fps
+        self.stream = stream or sys.stdout
+        self.view = self.VIEWS[0]
+        # Last message per failing/recent account only, so messages are not
+        # kept for every account. Failing accounts are bucketed by failure
+        # level (level -> email -> message), oldest failure first per bucket.
+        self.failing: dict[int, OrderedDict[str, str]] = {}
+        self.failing_level: dict[str, int] = {}
+        self.recent: OrderedDict[str, str] = OrderedDict()
+        self.notes: deque = deque(maxlen=self.NOTES)
+        self.totals = None
+        self.totals_at = 0.0
+        self.requests_at = (time.monotonic(), 0)
+        # Rendered cell text by (row, column), compared against every new frame
+        self.cells: dict[tuple[int, int], str] = {}
+        self.size = None
+        self.active = False
+        self._terminal = None
+
+    def record(self, email: str, level: str, message: str):
+        state = self.bot.account_states.get(email)
+        if state is None:
+            return
+        state.status = level
+        if level == "info":
+            state.failures = 0
+            self.unfail(email)
+        else:
+            state.failures += 1
+            self.fail(email, min(state.failures, self.FAILURE_LEVELS), message)
+        recent = self.recent
+        recent[email] = message
+        recent.move_to_end(email)
+        if len(recent) > self.RECENT_LIMIT:
+            recent.popitem(last=False)
+
+    def fail(self, email: str, level: int, message: str):
+        self.unfail(email)
+        self.failing.setdefault(level, OrderedDict())[email] = message
+        self.failing_level[email] = level
+        if len(self.failing_level) > self.FAILING_LIMIT:
+            # Past the limit, the account with the fewest failures that failed
+            # longest ago makes room; it comes back with its next failure
+            self.unfail(next(iter(self.failing[min(self.failing)])))
+
+    def unfail(self, email: str):
+        level = self.failing_level.pop(email, None)
+        if level is not None:
+            bucket = self.failing[level]
+            del bucket[email]
+            if not bucket:
+                del self.failing[level]
+
+    def forget(self, email: str):
+        self.unfail(email)
+        self.recent.pop(email, None)
+
+    def note(self, level: str, message: str):
+        if self.bot.log_sink.enabled(level):
+            self.notes.append((time.time(), level, ANSI_ESCAPE_REGEXP.sub("", message)))
+
+    def on_key(self, key: str):
+        if key in ("\t", "v"):
+            self.set_view(self.VIEWS[(self.VIEWS.index(self.view) + 1) % len(self.VIEWS)])
+        elif key in ("1", "2", "3"):
+            self.set_view(self.VIEWS[int(key) - 1])
+
+    def set_view(self, view: str):
+        if view != self.view:
+            self.view = view
+            # Column layout changes, so the next frame repaints everything
+            self.size = None
+            self.draw()
+
+    def count(self) -> dict:
+        # The one pass over every account, throttled to TOTALS_INTERVAL
+        statuses = dict.fromkeys(self.STATUSES, 0)
+        paused = 0
+        points = 0.0
+        for state in self.bot.account_states.values():
+            statuses[state.status] += 1
+            paused += state.token_valid is False
+            points += state.points or 0
+        pool = self.bot.proxy_pool
+        slowest = []
+        if pool:
+            # Proxy latency moves with every request, so the ranking is
+            # refreshed here rather than per event or per frame
+            def slowness(proxy):
+                stats = pool.stats[proxy.as_url]
+                return not pool.is_alive(proxy), stats.latency or 0.0
+
+            slowest = heapq.nlargest(self.PROXY_LIMIT, pool.proxies, key=slowness)
+        stats = self.bot.metrics._get("global", "")
+        now = time.monotonic()
+        last_time, last_requests = self.requests_at
+        self.requests_at = (now, stats.requests)
+        return {
+            "accounts": len(self.bot.account_states), "statuses": statuses, "paused": paused, "points": points,
+            "per_minute": (stats.requests - last_requests) * 60 / max(now - last_time, 1e-6),
+            "proxies": len(pool.proxies) if pool else 0,
+            "alive": sum(pool.is_alive(proxy) for proxy in pool.proxies) if pool else 0,
+            "slowest": slowest,
+        }
+
+    def header(self, width: int) -> list[list[tuple]]:
+        now = time.time()
+        if self.totals is None or now - self.totals_at >= self.TOTALS_INTERVAL:
+            self.totals = self.count()
+            self.totals_at = now
+        totals = self.totals
+        statuses = totals["statuses"]
+        stats = self.bot.metrics._get("global", "")
+        success_rate = stats.success_rate
+        p50, p99 = stats.latency.quantile(0.5), stats.latency.quantile(0.99)
+        proxies = f" | Proxies: {totals['alive']}/{totals['proxies']} alive" if totals["proxies"] else ""
+        tabs = [
+            (f"[{index}] {self.VIEW_TITLES[view]}", len(self.VIEW_TITLES[view]) + 4,
+             Fore.BLACK + Back.CYAN if view == self.view else Fore.CYAN)
+            for index, view in enumerate(self.VIEWS, 1)
+        ]
+        return [
+            [(f"Dawn Validator | {datetime.fromtimestamp(now, wib).strftime('%x %X %Z')} | "
+              f"Uptime: {self.bot.format_seconds(time.monotonic() - self.bot.metrics.started)}", width,
+              Fore.CYAN + Style.BRIGHT)],
+            [(f"Accounts: {totals['accounts']}", 16, Fore.WHITE + Style.BRIGHT),
+             (f"OK: {statuses['info']}", 13, Fore.GREEN + Style.BRIGHT),
+             (f"Warn: {statuses['warning']}", 13, Fore.YELLOW + Style.BRIGHT),
+             (f"Error: {statuses['error']}", 13, Fore.RED + Style.BRIGHT),
+             (f"Paused: {totals['paused']}", 14, Fore.RED),
+             (f"Waiting: {statuses[None]}", 16, Fore.WHITE),
+             (f"Points: {totals['points']:,.0f}", 0, Fore.GREEN + Style.BRIGHT)],
+            [(f"Requests: {stats.requests} ({totals['per_minute']:.0f}/min) | "
+              f"Success: {success_rate * 100 if success_rate is not None else 0:.1f}% | "
+              f"p50: {p50 or 0:.2f}s p99: {p99 or 0:.2f}s | In flight: {stats.in_flight} | "
+              f"Retries: {stats.retries}{proxies}", width, Fore.WHITE)],
+            tabs + [("(tab: next view)", 0, Fore.WHITE)],
+        ]
+
+    def account_rows(self, limit: int) -> list[list[tuple]]:
+        states = self.bot.account_states
+        if self.view == "failing":
+            # Most failures first, the latest failure first within a level
+            emails = []
+            for level in sorted(self.failing, reverse=True):
+                emails.extend(islice(reversed(self.failing[level]), limit - len(emails)))
+                if len(emails) >= limit:
+                    break
+        else:
+            emails = list(islice(reversed(self.recent), limit))
+        now = time.time()
+        rows = []
+        for email in emails:
+            state = states.get(email)
+            if state is None:
+                continue
+            status, color = self.STATUSES[state.status]
+            if state.token_valid is False:
+                status, color = "✗ Paused", Fore.RED
+            proxy = self.bot.proxy_assigner.proxy_for(email)
+            rows.append([
+                (self.bot.mask_account(email), 0, Fore.CYAN),
+                (status, 0, color + Style.BRIGHT),
+                (str(state.failures), 0, Fore.RED if state.failures else Fore.WHITE),
+                (self.bot.format_seconds(now - state.last_ping) if state.last_ping else "-", 0, Fore.WHITE),
+                (f"{state.points:,.0f}" if state.points is not None else "-", 0, Fore.GREEN),
+                (f"{proxy.host}:{proxy.port}" if proxy else "-", 0, Fore.WHITE),
+                (self.failing[self.failing_level[email]][email] if email in self.failing_level
+                 else self.recent.get(email, ""), 0, color),
+            ])
+        return rows
+
+    def proxy_rows(self, limit: int) -> list[list[tuple]]:
+        pool = self.bot.proxy_pool
+        if pool is None:
+            return []
+        rows = []
+        for proxy in islice(self.totals["slowest"], limit):
+            key = proxy.as_url
+            stats = pool.stats.get(key)
+            if stats is None:
+                # Dropped by a proxy reload since the last ranking
+                continue
+            breaker = pool.breakers[key].state
+            state = "dead" if not stats.alive else "alive" if breaker == "closed" else breaker
+            requests = self.bot.metrics.stats.get(("proxy", f"{proxy.protocol}://{proxy.host}:{proxy.port}"))
+            p50 = requests.latency.quantile(0.5) if requests else None
+            p99 = requests.latency.quantile(0.99) if requests else None
+            total = requests.requests if requests else 0
+            errors = total - requests.outcomes.get("ok", 0) if requests else 0
+            rows.append([
+                (f"{proxy.protocol}://{proxy.host}:{proxy.port}", 0, Fore.CYAN),
+                (state, 0, (Fore.GREEN if state == "alive" else Fore.RED) + Style.BRIGHT),
+                (f"{stats.latency:.2f}s" if stats.latency is not None else "-", 0, Fore.WHITE),
+                (f"{stats.success * 100:.0f}%", 0, Fore.GREEN if stats.success >= 0.8 else Fore.YELLOW),
+                (f"{p50:.2f}s" if p50 is not None else "-", 0, Fore.WHITE),
+                (f"{p99:.2f}s" if p99 is not None else "-", 0, Fore.WHITE),
+                (str(total), 0, Fore.WHITE),
+                (str(errors), 0, Fore.RED if errors else Fore.WHITE),
+                (str(self.bot.proxy_assigner.load.get(key, 0)), 0, Fore.WHITE),
+            ])
+        return rows
+
+    def frame(self, width: int, height: int) -> list[list[tuple]]:
+        rows = self.header(width)
+        columns = self.PROXY_COLUMNS if self.view == "proxies" else self.ACCOUNT_COLUMNS
+        rows.append([(title, size, Fore.MAGENTA + Style.BRIGHT) for title, size in columns])
+        # Notes get the bottom lines, after a blank separator
+        limit = max(height - len(rows) - self.NOTES - 1, 0)
+        table = self.proxy_rows(limit) if self.view == "proxies" else self.account_rows(limit)
+        # Every table row has the same cells, so padding rows blank out what
+        # was drawn there before
+        blank = [("", size, None) for _, size in columns]
+        if not table and limit:
+            table = [[(self.VIEW_EMPTY[self.view], 0, Fore.WHITE)] + blank[1:]]
+        for row in table:
+            rows.append([(text, size, color) for (text, _, color), (_, size) in zip(row, columns)])
+        rows.extend([blank] * (limit - len(table)))
+        rows.append([("", width, None)])
+        notes = [
+            [(f"{datetime.fromtimestamp(stamp, wib).strftime('%X')} {message}", width,
+              Fore.RED if level == "error" else Fore.YELLOW if level == "warning" else Fore.WHITE)]
+            for stamp, level, message in self.notes
+        ]
+        rows.extend(notes + [[("", width, None)]] * (self.NOTES - len(notes)))
+        return rows[:height]
+
+    def draw(self):
+        # Leaves the last line and column alone so the terminal never scrolls
+        size = shutil.get_terminal_size()
+        width, height = size.columns - 1, size.lines - 1
+        out = []
+        if size != self.size:
+            self.size = size
+            self.cells.clear()
+            out.append("\x1b[2J")
+        for y, row in enumerate(self.frame(width, height)):
+            x = 0
+            for column, (text, cell_width, color) in enumerate(row):
+                cell_width = min(cell_width or width - x, width - x)
+                if cell_width <= 0:
+                    break
+                cell = text[:cell_width].ljust(cell_width)
+                if color:
+                    cell = f"{color}{cell}{Style.RESET_ALL}"
+                if self.cells.get((y, column)) != cell:
+                    self.cells[(y, column)] = cell
+                    out.append(f"\x1b[{y + 1};{x + 1}H{cell}")
+                x += cell_width + 1
+        if out:
+            self._write("".join(out))
+
+    def _write(self, text: str):
+        try:
+            self.stream.write(text)
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def _read_keys(self):
+        for key in os.read(self._terminal[0], 64).decode(errors="ignore"):
+            self.on_key(key)
+
+    def open(self):
+        if os.name == "nt":
+            import colorama
+            # Makes the Windows console understand the cursor movement codes
+            getattr(colorama, "just_fix_windows_console", colorama.init)()
+        elif sys.stdin.isatty():
+            import termios, tty
+            fd = sys.stdin.fileno()
+            self._terminal = (fd, termios.tcgetattr(fd))
+            # Keys arrive one by one without echo; Ctrl+C still interrupts
+            tty.setcbreak(fd)
+            asyncio.get_running_loop().add_reader(fd, self._read_keys)
+        self.active = True
+        # Alternate screen with the cursor hidden, as full-screen tools do
+        self._write("\x1b[?1049h\x1b[?25l")
+
+    def close(self):
+        if not self.active:
+            return
+        self.active = False
+        if self._terminal:
+            import termios
+            fd, attributes = self._terminal
+            self._terminal = None
+            try:
+                asyncio.get_running_loop().remove_reader(fd)
+            except RuntimeError:
+                pass
+            termios.tcsetattr(fd, termios.TCSADRAIN, attributes)
+        self._write("\x1b[?25h\x1b[?1049l")
+
+    def poll_keys(self):
+        if os.name == "nt":
+            import msvcrt
+            while msvcrt.kbhit():
+                self.on_key(msvcrt.getwch())
+
+    async def run(self):
+        self.open()
+        try:
+            while True:
+                self.poll_keys()
+                self.draw()
+                await asyncio.sleep(1 / self.fps)
+        finally:
+            self.close()
+
+class AccountStore:
+    # SQLite-backed account store. The unique email index gives O(1) lookups,
+    # updates and deletes, and every change is a small atomic transaction
+    # instead of a rewrite of the whole accounts file. Rows remember whether
+    # they came from accounts.json or the menu, so imports leave menu edits be,
+    # and emails deleted or renamed away in the menu are kept in `removed`
+    # so imports don't bring them back while the file still lists them.
+    def __init__(self, path: Path | str):
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS accounts ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, email TEXT NOT NULL UNIQUE, token TEXT NOT NULL)"
+            )
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS removed (email TEXT PRIMARY KEY)")
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(accounts)")]
+            if "source" not in columns:
+                # Stores from before the column can't tell; treat them as imported
+                self.conn.execute("ALTER TABLE accounts ADD COLUMN source TEXT NOT NULL DEFAULT 'json'")
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+
+    def all(self) -> list[dict]:
+        rows = self.conn.execute("SELECT email, token FROM accounts ORDER BY id")
+        return [{"Email": email, "Token": token} for email, token in rows]
+
+    def get(self, email: str) -> dict | None:
+        row = self.conn.execute("SELECT email, token FROM accounts WHERE email = ?", (email,)).fetchone()
+        return {"Email": row[0], "Token": row[1]} if row else None
+
+    def add(self, email: str, token: str):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO accounts (email, token, source) VALUES (?, ?, 'menu') "
+                "ON CONFLICT(email) DO UPDATE SET token = excluded.token, source = 'menu'",
+                (email, token)
+            )
+            self.conn.execute("DELETE FROM removed WHERE email = ?", (email,))
+
+    def update(self, email: str, new_email: str | None = None, token: str | None = None) -> bool:
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE accounts SET email = COALESCE(?, email), token = COALESCE(?, token), source = 'menu' "
+                "WHERE email = ?",
+                (new_email, token, email)
+            )
+            if cursor.rowcount and new_email and new_email != email:
+                self.conn.execute("INSERT OR IGNORE INTO removed (email) VALUES (?)", (email,))
+                self.conn.execute("DELETE FROM removed WHERE email = ?", (new_email,))
+        return cursor.rowcount > 0
+
+    def delete(self, email: str) -> bool:
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM accounts WHERE email = ?", (email,))
+            if cursor.rowcount:
+                self.conn.execute("INSERT OR IGNORE INTO removed (email) VALUES (?)", (email,))
+        return cursor.rowcount > 0
+
+    def data_version(self) -> int:
+        # Changes whenever another connection (menu, another process) commits
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get_meta(self, key: str) -> str | None:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def import_json(self, filepath: Path | str, stamp: str | None = None) -> int:
+        # Upserts the file's accounts and drops previously imported ones that
+        # left the file, in one transaction. Accounts added or edited from the
+        # menu are neither overwritten nor deleted, and ones removed from the
+        # menu are skipped until they leave the file too. The last duplicate
+        # of an email wins.
+        with open(filepath, 'r') as file:
+            data = json.load(file)
+        if not isinstance(data, list):
+            raise ValueError(f"{filepath} must contain a list of accounts")
+        accounts = {}
+        for account in data:
+            if isinstance(account, dict) and isinstance(account.get("Email"), str):
+                accounts.pop(account["Email"], None)
+                accounts[account["Email"]] = str(account.get("Token") or "")
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS imported (email TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM imported")
+            self.conn.executemany("INSERT INTO imported (email) VALUES (?)", ((email,) for email in accounts))
+            # Tombstones only matter while the file still lists the email
+            self.conn.execute("DELETE FROM removed WHERE email NOT IN (SELECT email FROM imported)")
+            removed = {row[0] for row in self.conn.execute("SELECT email FROM removed")}
+            self.conn.executemany(
+                "INSERT INTO accounts (email, token, source) VALUES (?, ?, 'json') "
+                "ON CONFLICT(email) DO UPDATE SET token = excluded.token WHERE source = 'json'",
+                ((email, token) for email, token in accounts.items() if email not in removed)
+            )
+            self.conn.execute(
+                "DELETE FROM accounts WHERE source = 'json' AND email NOT IN (SELECT email FROM imported)"
+            )
+            if stamp:
+                self.conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('json_stamp', ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (stamp,)
+                )
+        return len(accounts) - len(removed)
+
+    def close(self):
+        self.conn.close()
+
+class HashRing:
+    # Consistent hashing with virtual nodes: adding a shard only moves about
+    # 1/N of the keys, and every host computes the same mapping.
+    def __init__(self, shards: int, replicas: int = 100):
+        self.shards = shards
+        self.ring = sorted(
+            (self.hash(f"shard-{shard}:{replica}"), shard)
+            for shard in range(shards) for replica in range(replicas)
+        )
+        self.points = [point for point, _ in self.ring]
+
+    @staticmethod
+    def hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+    def shard_for(self, key: str) -> int:
+        index = bisect_left(self.points, self.hash(key.lower())) % len(self.points)
+        return self.ring[index][1]
+
+def parse_shard_ids(value, shard_count: int) -> list[int]:
+    if value is None:
+        return list(range(shard_count))
+    if isinstance(value, list):
+        shard_ids = [int(shard) for shard in value]
+    else:
+        shard_ids = []
+        for part in str(value).split(","):
+            start, _, end = part.partition("-")
+            shard_ids.extend(range(int(start), int(end or start) + 1))
+    invalid = [shard for shard in shard_ids if not 0 <= shard < shard_count]
+    if invalid:
+        raise ValueError(f"Shard ids out of range 0-{shard_count - 1}: {invalid}")
+    return sorted(set(shard_ids))
+
+def run_shard(settings: dict, shard_index: int):
+    bot = Dawn()
+    bot.configure(settings)
+    bot.shard_index = shard_index
+    bot.log_sink.tag = f"shard {shard_index}"
+    sys.exit(asyncio.run(bot.run_headless()))
+
+class ShardSupervisor:
+    # Runs one worker process per local shard, restarts crashed ones with
+    # backoff and prints an aggregate of every shard's status file. Several
+    # hosts can split the shard ids and share status_dir (e.g. over NFS).
+    # A worker that stayed up for STABLE_AFTER seconds starts its backoff over.
+    STABLE_AFTER = 300
+
+    def __init__(self, settings: dict, log, sync_accounts=None):
+        self.settings = settings
+        self.log = log
+        # Imports accounts.json for all local workers, which share one store
+        self.sync_accounts = sync_accounts
+        self.watch_interval = settings["watch_interval"]
+        self.shard_count = settings["shard_count"]
+        self.shard_ids = parse_shard_ids(settings["shard_ids"], self.shard_count)
+        self.status_dir = Path(settings["status_dir"])
+        self.interval = settings["metrics_interval"] or 60
+        import multiprocessing
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            # Workers fork from a server process that has already imported this
+            # module and the network stack, so starting or restarting a shard
+            # skips the import cost
+            self.context = multiprocessing.get_context("forkserver")
+            self.context.set_forkserver_preload(["__main__", "aiohttp", "aiohttp_socks"])
+        else:
+            self.context = multiprocessing.get_context("spawn")
+        self.processes: dict[int, multiprocessing.Process] = {}
+        self.restarts: dict[int, int] = {}
+        self.restart_at: dict[int, float] = {}
+        self.started_at: dict[int, float] = {}
+        self.stopping = False
+
+    def start_worker(self, shard: int):
+        # Workers must not download the public list themselves; the supervisor already did
+        settings = {**self.settings, "proxy_download": False}
+        process = self.context.Process(target=run_shard, args=(settings, shard), name=f"dawn-shard-{shard}")
+        process.start()
+        self.processes[shard] = process
+        self.started_at[shard] = time.monotonic()
+
+    def check_workers(self):
+        now = time.monotonic()
+        for shard, process in list(self.processes.items()):
+            if process.is_alive() or process.exitcode is None:
+                continue
+            if process.exitcode == 0:
+                # Clean finish, e.g. a shard the hash ring gave no accounts
+                self.log(f"{Fore.YELLOW + Style.BRIGHT}Shard {shard} finished{Style.RESET_ALL}")
+                del self.processes[shard]
+                continue
+            if shard not in self.restart_at:
+                if now - self.started_at.get(shard, now) >= self.STABLE_AFTER:
+                    self.restarts[shard] = 0
+                self.restarts[shard] = self.restarts.get(shard, 0) + 1
+                delay = min(60, 2 ** self.restarts[shard])
+                self.restart_at[shard] = now + delay
+                self.log(
+                    f"{Fore.RED + Style.BRIGHT}✗ Shard {shard} crashed (exit {process.exitcode}), "
+                    f"restarting in {delay}s{Style.RESET_ALL}", "error"
+                )
+            elif now >= self.restart_at[shard]:
+                del self.restart_at[shard]
+                self.start_worker(shard)
+
+    def aggregate_status(self) -> str:
+        statuses = []
+        for path in self.status_dir.glob("shard-*.json"):
+            try:
+                with open(path, 'r') as file:
+                    statuses.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+        fresh = [status for status in statuses if time.time() - status.get("updated", 0) < self.interval * 3]
+        requests = sum(status.get("requests", 0) for status in fresh)
+        ok = sum(status.get("ok", 0) for status in fresh)
+        hosts = len({status.get("host") for status in fresh})
+        return (
+            f"Shards: {len(fresh)}/{self.shard_count} reporting on {hosts} host(s) | "
+            f"Local workers: {sum(process.is_alive() for process in self.processes.values())}/{len(self.shard_ids)} | "
+            f"Accounts: {sum(status.get('accounts', 0) for status in fresh)} | "
+            f"Requests: {requests} | Success: {ok * 100 / requests if requests else 0:.1f}% | "
+            f"In flight: {sum(status.get('in_flight', 0) for status in fresh)}"
+        )
+
+    def import_accounts(self):
+        if self.sync_accounts is None:
+            return
+        try:
+            self.sync_accounts()
+        except sqlite3.Error as e:
+            self.log(f"{Fore.RED + Style.BRIGHT}✗ Account import failed: {e}{Style.RESET_ALL}", "error")
+
+    def stop(self, *_):
+        self.stopping = True
+
+    def run(self) -> int:
+        self.status_dir.mkdir(parents=True, exist_ok=True)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        self.log(
+            f"{Fore.GREEN + Style.BRIGHT}✓ Starting shards {self.shard_ids} of {self.shard_count}{Style.RESET_ALL}"
+        )
+        self.import_accounts()
+        for shard in self.shard_ids:
+            self.start_worker(shard)
+        next_report = time.monotonic() + self.interval
+        next_import = time.monotonic() + self.watch_interval
+        while not self.stopping and (self.processes or self.restart_at):
+            time.sleep(1)
+            self.check_workers()
+            if self.watch_interval and time.monotonic() >= next_import:
+                next_import = time.monotonic() + self.watch_interval
+                self.import_accounts()
+            if time.monotonic() >= next_report:
+                next_report += self.interval
+                self.log(f"{Fore.BLUE + Style.BRIGHT}{self.aggregate_status()}{Style.RESET_ALL}")
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(timeout=30)
+        self.log(f"{Fore.RED + Style.BRIGHT}✗ All shards stopped{Style.RESET_ALL}")
+        return 0
 
 class Dawn:
     def __init__(self) -> None:
@@ -149,22 +1780,110 @@ class Dawn:
             "Sec-Fetch-Dest": "empty",
             "Sec-Fetch-Mode": "cors",
             "Sec-Fetch-Site": "cross-site",
-            "User-Agent": FakeUserAgent().random
+            "Content-Type": "application/json",
         }
+        # User agents are per account (see user_agent_for); None = bundled pool
+        self.user_agent_source = None
         self.BASE_API = "https://ext-api.dawninternet.com"
+        self.accounts_file = "accounts.json"
+        self.accounts_db = None
+        self.account_store = None
+        self.proxy_file = "proxy.txt"
+        self.proxy_choice = PROXY_MODES["none"]
+        self.proxy_download = True
+        self.use_proxy = False
+        self.watch_interval = 5
+        self.workers = 200
+        self.account_states: dict[str, AccountState] = {}
+        self.state_file = "state.json"
+        self.state_interval = 60
+        # Periodic writes run in a thread and can overlap the final save on
+        # shutdown; the lock orders them and older snapshots are dropped
+        self.state_lock = threading.Lock()
+        self.state_saved = 0.0
+        self.shard_index = None
+        self.shard_ring = None
+        self.status_dir = Path("shards")
+        self.log_sink = LogSink()
+        self.headless = False
+        self.ui = "auto"
+        self.dashboard_fps = 4
+        # Set while the live dashboard owns the terminal; events go to it instead
+        # of the log sink
+        self.dashboard = None
+        self.retry_policy = RetryPolicy()
+        self.session_pool = SessionPool(headers=self.headers)
+        self.limiter = RequestLimiter()
+        self.ping_interval = 10 * 60
+        self.earning_interval = 10 * 60
+        self.earning_mode = "adaptive"
+        self.earning_max_interval = 6 * 60 * 60
+        self.point_extractor = PointExtractor()
+        self.scheduler = None
+        # Bound once: every account's jobs share these instead of holding a
+        # fresh bound method each
+        self.job_funcs = {"keepalive": self.process_send_keepalive, "earning": self.process_user_earning}
+        self.metrics = Metrics()
+        self.metrics_port = None
+        self.metrics_interval = 60
         self.proxies = []
-        self.proxy_index = 0
-        self.account_proxies = {}
+        self.proxy_pool = None
+        self.proxy_check_concurrency = 200
+        self.proxy_check_timeout = 10
+        self.proxy_check_interval = 5 * 60
+        self.proxy_assigner = ProxyAssigner()
+        # Stamp of the proxy file as last read, shared by the watcher and reloads
+        self.proxy_stamp = None
+
+    def configure(self, settings: dict):
+        self.BASE_API = settings["base_api"]
+        self.accounts_file = settings["accounts_file"]
+        self.accounts_db = settings["accounts_db"]
+        self.proxy_file = settings["proxy_file"]
+        self.proxy_choice = PROXY_MODES[settings["proxy_mode"]]
+        self.workers = settings["workers"]
+        self.limiter = RequestLimiter(
+            settings["max_concurrency"], settings["per_proxy_concurrency"],
+            settings["per_proxy_rate"], settings["per_host_rate"]
+        )
+        self.session_pool = SessionPool(
+            limit=settings["session_limit"], max_sessions=settings["max_sessions"],
+            idle_ttl=settings["session_idle_ttl"], headers=self.headers
+        )
+        self.proxy_assigner = ProxyAssigner(settings["max_accounts_per_proxy"])
+        self.proxy_check_concurrency = settings["proxy_check_concurrency"]
+        self.proxy_check_timeout = settings["proxy_check_timeout"]
+        self.proxy_check_interval = settings["proxy_check_interval"]
+        self.ping_interval = settings["ping_interval"]
+        self.earning_interval = settings["earning_interval"]
+        self.earning_mode = settings["earning_mode"]
+        self.earning_max_interval = max(settings["earning_max_interval"], self.earning_interval)
+        self.log_sink.level = settings["log_level"]
+        self.log_sink.fmt = settings["log_format"]
+        self.headless = settings["headless"]
+        self.ui = settings["ui"]
+        self.dashboard_fps = settings["dashboard_fps"]
+        self.metrics_port = settings["metrics_port"]
+        self.metrics_interval = settings["metrics_interval"]
+        self.proxy_download = settings["proxy_download"]
+        self.watch_interval = settings["watch_interval"]
+        self.shard_ring = HashRing(settings["shard_count"]) if settings["shard_count"] > 1 else None
+        self.status_dir = Path(settings["status_dir"])
+        self.state_file = settings["state_file"]
+        self.state_interval = settings["state_interval"]
+        self.user_agent_source = settings["user_agents"]
+
+    def owns(self, key: str) -> bool:
+        return self.shard_ring is None or self.shard_index is None or self.shard_ring.shard_for(key) == self.shard_index
 
     def clear_terminal(self):
         os.system('cls' if os.name == 'nt' else 'clear')
 
-    def log(self, message):
-        print(
-            f"{Fore.CYAN + Style.BRIGHT}╭─[{datetime.now().astimezone(wib).strftime('%x %X %Z')}]{Style.RESET_ALL}\n"
-            f"{Fore.CYAN + Style.BRIGHT}╰──▶{Style.RESET_ALL} {message}",
-            flush=True
-        )
+    def log(self, message, level="info"):
+        if self.dashboard:
+            self.dashboard.note(level, message)
+        else:
+            self.log_sink.emit(level, message)
 
     def welcome(self):
         print(
@@ -184,47 +1903,114 @@ class Dawn:
         minutes, seconds = divmod(remainder, 60)
         return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
 
-    def load_accounts(self):
-        filename = "accounts.json"
-        try:
-            if not os.path.exists(filename):
-                self.log(f"{Fore.RED}✗ File {filename} not found, creating empty file{Style.RESET_ALL}")
+    def load_user_agents(self, source: str | None) -> tuple:
+        if not source:
+            return USER_AGENTS
+        if source == "fake-useragent":
+            # Optional, and only loaded when asked for: its database is slow to read
+            try:
+                from fake_useragent import FakeUserAgent
+                try:
+                    user_agent = FakeUserAgent(browsers=["Chrome"], platforms=["desktop"])
+                except TypeError:
+                    # Versions before 1.5 have no platforms filter
+                    user_agent = FakeUserAgent(browsers=["Chrome"])
+                user_agents = tuple(sorted({user_agent.random for _ in range(200)}))
+            except Exception as e:
+                self.log(f"{Fore.YELLOW + Style.BRIGHT}✗ fake-useragent unavailable, using bundled user agents: {e}{Style.RESET_ALL}", "warning")
+                return USER_AGENTS
+        else:
+            try:
+                with open(source, 'r') as file:
+                    user_agents = tuple(line.strip() for line in file if line.strip())
+            except OSError as e:
+                self.log(f"{Fore.YELLOW + Style.BRIGHT}✗ Cannot read {source}, using bundled user agents: {e}{Style.RESET_ALL}", "warning")
+                return USER_AGENTS
+        return user_agents or USER_AGENTS
+
+    @cached_property
+    def user_agents(self) -> tuple:
+        return self.load_user_agents(self.user_agent_source)
+
+    def user_agent_for(self, email: str) -> str:
+        # Stable per account across restarts and shards, and a shared string from the pool
+        user_agents = self.user_agents
+        digest = hashlib.blake2b(email.encode(), digest_size=4).digest()
+        return user_agents[int.from_bytes(digest, "big") % len(user_agents)]
+
+    def open_account_store(self) -> AccountStore:
+        if self.account_store is None:
+            path = self.accounts_db or Path(self.accounts_file).with_suffix(".db")
+            self.account_store = AccountStore(path)
+        return self.account_store
+
+    def sync_accounts_file(self) -> bool:
+        # accounts.json is imported whenever it changes on disk; otherwise the
+        # store is the source of truth and menu edits never rewrite the file.
+        # Shard workers leave the import to their supervisor and only read.
+        if self.shard_index is not None:
+            return False
+        filename = self.accounts_file
+        store = self.open_account_store()
+        if not os.path.exists(filename):
+            if not len(store):
+                self.log(f"{Fore.YELLOW}✗ File {filename} not found, creating empty file{Style.RESET_ALL}", "warning")
                 with open(filename, 'w') as file:
                     json.dump([], file)
-                return []
-            with open(filename, 'r') as file:
-                data = json.load(file)
-                if isinstance(data, list):
-                    return data
-                return []
-        except json.JSONDecodeError:
-            self.log(f"{Fore.RED}✗ Invalid JSON in {filename}, resetting to empty{Style.RESET_ALL}")
-            with open(filename, 'w') as file:
-                json.dump([], file)
-            return []
+            return False
+        stat = os.stat(filename)
+        stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+        if store.get_meta("json_stamp") == stamp:
+            return False
+        try:
+            count = store.import_json(filename, stamp)
+        except (json.JSONDecodeError, ValueError) as e:
+            self.log(f"{Fore.RED}✗ Invalid JSON in {filename}, keeping stored accounts: {e}{Style.RESET_ALL}", "error")
+            return False
+        self.log(f"{Fore.GREEN}✓ Imported {count} accounts from {filename}{Style.RESET_ALL}")
+        return True
 
-    def save_accounts(self, accounts):
-        filename = "accounts.json"
+    def load_accounts(self):
         try:
-            with open(filename, 'w') as file:
-                json.dump(accounts, file, indent=4)
-            self.log(f"{Fore.GREEN}✓ Accounts saved to {filename}{Style.RESET_ALL}")
-        except Exception as e:
-            self.log(f"{Fore.RED}✗ Failed to save accounts: {e}{Style.RESET_ALL}")
+            self.sync_accounts_file()
+            return self.open_account_store().all()
+        except sqlite3.Error as e:
+            self.log(f"{Fore.RED}✗ Failed to load accounts: {e}{Style.RESET_ALL}", "error")
+            return []
+
+    async def download_proxies(self, url: str, filename: str):
+        # Stream to a temp file in chunks so large lists never sit in memory whole
+        from aiohttp import ClientSession, ClientTimeout
+        temp_filename = f"{filename}.tmp"
+        async with ClientSession(timeout=ClientTimeout(total=None, sock_connect=30, sock_read=60)) as session:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                with open(temp_filename, 'wb') as file:
+                    async for chunk in response.content.iter_chunked(1 << 16):
+                        file.write(chunk)
+        os.replace(temp_filename, filename)
+
+    async def read_proxies(self, use_proxy_choice: int, download: bool = True) -> list:
+        filename = self.proxy_file
+        if use_proxy_choice == 1 and download and self.proxy_download:
+            await self.download_proxies(MONOSANS_PROXY_URL, filename)
+        # Public lists are huge and get health-checked anyway, so skip the full validation there
+        proxies, invalid = ProxyRecord.from_file(filename, validate=use_proxy_choice == 2)
+        if invalid:
+            self.log(f"{Fore.YELLOW + Style.BRIGHT}✗ Skipped invalid proxy lines: {invalid}{Style.RESET_ALL}", "warning")
+        if self.shard_ring and self.shard_index is not None:
+            shard_proxies = [proxy for proxy in proxies if self.owns(proxy.as_url)]
+            if shard_proxies:
+                return shard_proxies
+            self.log(f"{Fore.YELLOW + Style.BRIGHT}✗ No proxies hash to this shard, sharing the full list{Style.RESET_ALL}", "warning")
+        return proxies
 
     async def load_proxies(self, use_proxy_choice: int):
-        filename = "proxy.txt"
         try:
-            if use_proxy_choice == 1:
-                response = requests.get("https://raw.githubusercontent.com/monosans/proxy-list/main/proxies/all.txt")
-                response.raise_for_status()
-                content = response.text
-                with open(filename, 'w') as file:
-                    file.write(content)
-            self.proxies = Proxy.from_file(filename)
+            self.proxies = await self.read_proxies(use_proxy_choice)
 
             if not self.proxies:
-                self.log(f"{Fore.RED + Style.BRIGHT}✗ No proxies found{Style.RESET_ALL}")
+                self.log(f"{Fore.RED + Style.BRIGHT}✗ No proxies found{Style.RESET_ALL}", "error")
                 return
 
             self.log(
@@ -233,25 +2019,70 @@ class Dawn:
             )
 
         except Exception as e:
-            self.log(f"{Fore.RED + Style.BRIGHT}✗ Proxy load failed: {e}{Style.RESET_ALL}")
+            self.log(f"{Fore.RED + Style.BRIGHT}✗ Proxy load failed: {e}{Style.RESET_ALL}", "error")
             self.proxies = []
 
+    def new_proxy_pool(self, proxies: list) -> ProxyPool:
+        return ProxyPool(
+            proxies, self.BASE_API, self.proxy_check_concurrency, self.proxy_check_timeout, self.proxy_check_interval
+        )
+
+    async def check_proxies(self):
+        self.proxy_pool = self.new_proxy_pool(self.proxies)
+        self.log(f"{Fore.BLUE + Style.BRIGHT}Checking {len(self.proxies)} proxies...{Style.RESET_ALL}")
+        await self.proxy_pool.check_all()
+        self.sync_proxy_assigner()
+        self.log(
+            f"{Fore.GREEN + Style.BRIGHT}✓ Healthy proxies: {Style.RESET_ALL}"
+            f"{Fore.WHITE + Style.BRIGHT}{len(self.proxy_pool.ranked)}/{len(self.proxies)}{Style.RESET_ALL}"
+        )
+
+    async def run_proxy_checks(self):
+        # Runs even without a pool yet, so proxies that a reload brings in
+        # later are checked too
+        while True:
+            await asyncio.sleep(self.proxy_check_interval)
+            if self.proxy_pool:
+                await self.proxy_pool.check_all()
+                self.sync_proxy_assigner()
+
+    def sync_proxy_assigner(self):
+        # Ranked order is health order, so among equally loaded proxies the
+        # healthiest ones sit first in their load bucket.
+        alive = {proxy.as_url for proxy in self.proxy_pool.ranked}
+        for proxy in list(self.proxy_assigner.proxies.values()):
+            if proxy.as_url not in alive:
+                self.evict_proxy(proxy)
+        for proxy in self.proxy_pool.ranked:
+            self.proxy_assigner.add(proxy)
+
+    def evict_proxy(self, proxy):
+        for email in self.proxy_assigner.remove(proxy):
+            self.proxy_assigner.assign(email)
+
+    def assign_proxy(self, email, exclude=None):
+        return self.proxy_assigner.assign(email, exclude)
+
     def get_next_proxy_for_account(self, email):
-        if email not in self.account_proxies:
-            if not self.proxies:
-                return None
-            proxy = self.proxies[self.proxy_index]
-            self.account_proxies[email] = proxy
-            self.proxy_index = (self.proxy_index + 1) % len(self.proxies)
-        return self.account_proxies[email]
+        proxy = self.proxy_assigner.proxy_for(email)
+        if proxy is None or not self.proxy_pool.is_alive(proxy):
+            proxy = self.assign_proxy(email)
+        return proxy
 
     def rotate_proxy_for_account(self, email):
-        if not self.proxies:
-            return None
-        proxy = self.proxies[self.proxy_index]
-        self.account_proxies[email] = proxy
-        self.proxy_index = (self.proxy_index + 1) % len(self.proxies)
-        return proxy
+        return self.assign_proxy(email, exclude=self.proxy_assigner.proxy_for(email))
+
+    def record_proxy(self, proxy, ok: bool, started: float | None = None):
+        if proxy and self.proxy_pool:
+            self.proxy_pool.record(proxy, ok, time.monotonic() - started if started else None)
+            if not ok and not self.proxy_pool.is_alive(proxy):
+                self.evict_proxy(proxy)
+
+    @asynccontextmanager
+    async def open_request(self, proxy=None):
+        async with self.limiter.slot(proxy, self.BASE_API):
+            async with self.session_pool.acquire(proxy) as session:
+                yield session
 
     def generate_app_id(self):
         prefix = "67"
@@ -267,15 +2098,12 @@ class Dawn:
         return mask_account
 
     def print_message(self, email, proxy, color, message):
-        proxy_str = proxy.as_url if proxy else 'No Proxy'
-        self.log(
-            f"{Fore.MAGENTA + Style.BRIGHT}Account:{Style.RESET_ALL} "
-            f"{Fore.CYAN + Style.BRIGHT}{self.mask_account(email)}{Style.RESET_ALL} | "
-            f"{Fore.MAGENTA + Style.BRIGHT}Proxy:{Style.RESET_ALL} "
-            f"{Fore.CYAN + Style.BRIGHT}{proxy_str}{Style.RESET_ALL}\n"
-            f"{Fore.MAGENTA + Style.BRIGHT}Status:{Style.RESET_ALL} "
-            f"{color + Style.BRIGHT}{message}{Style.RESET_ALL}"
-        )
+        level = "error" if color == Fore.RED else "warning" if color == Fore.YELLOW else "info"
+        if self.dashboard:
+            self.dashboard.record(email, level, message)
+        elif self.log_sink.enabled(level):
+            proxy_str = proxy.as_url if proxy else 'No Proxy'
+            self.log_sink.emit(level, message, color, self.mask_account(email), proxy_str)
 
     def print_question(self):
         while True:
@@ -298,10 +2126,10 @@ class Dawn:
             except ValueError:
                 print(f"{Fore.RED + Style.BRIGHT}✗ Invalid input. Enter a number{Style.RESET_ALL}")
 
-    def display_accounts(self):
-        accounts = self.load_accounts()
+    def display_accounts(self, accounts=None):
+        accounts = self.load_accounts() if accounts is None else accounts
         if not accounts:
-            self.log(f"{Fore.YELLOW}No accounts found in accounts.json{Style.RESET_ALL}")
+            self.log(f"{Fore.YELLOW}No accounts found in {self.accounts_file}{Style.RESET_ALL}")
             return
         self.log(f"{Fore.CYAN}Current Accounts:{Style.RESET_ALL}")
         for i, account in enumerate(accounts, 1):
@@ -318,9 +2146,11 @@ class Dawn:
         if not token:
             self.log(f"{Fore.RED}✗ Token cannot be empty{Style.RESET_ALL}")
             return
-        accounts = self.load_accounts()
-        accounts.append({"Email": email, "Token": token})
-        self.save_accounts(accounts)
+        try:
+            self.open_account_store().add(email, token)
+        except sqlite3.Error as e:
+            self.log(f"{Fore.RED}✗ Failed to save account: {e}{Style.RESET_ALL}")
+            return
         self.log(f"{Fore.GREEN}✓ Account added: {self.mask_account(email)}{Style.RESET_ALL}")
 
     def edit_account(self):
@@ -328,7 +2158,7 @@ class Dawn:
         if not accounts:
             self.log(f"{Fore.YELLOW}No accounts to edit{Style.RESET_ALL}")
             return
-        self.display_accounts()
+        self.display_accounts(accounts)
         try:
             index = int(input(f"{Fore.YELLOW + Style.BRIGHT}Select account number to edit (1-{len(accounts)}): {Style.RESET_ALL}").strip()) - 1
             if index < 0 or index >= len(accounts):
@@ -336,15 +2166,15 @@ class Dawn:
                 return
             email = input(f"{Fore.YELLOW + Style.BRIGHT}Enter new email (leave blank to keep {self.mask_account(accounts[index]['Email'])}): {Style.RESET_ALL}").strip()
             token = input(f"{Fore.YELLOW + Style.BRIGHT}Enter new token (leave blank to keep current): {Style.RESET_ALL}").strip()
-            if email:
-                if '@' not in email:
-                    self.log(f"{Fore.RED}✗ Invalid email format{Style.RESET_ALL}")
-                    return
-                accounts[index]["Email"] = email
-            if token:
-                accounts[index]["Token"] = token
-            self.save_accounts(accounts)
-            self.log(f"{Fore.GREEN}✓ Account updated: {self.mask_account(accounts[index]['Email'])}{Style.RESET_ALL}")
+            if email and '@' not in email:
+                self.log(f"{Fore.RED}✗ Invalid email format{Style.RESET_ALL}")
+                return
+            self.open_account_store().update(accounts[index]["Email"], email or None, token or None)
+            self.log(f"{Fore.GREEN}✓ Account updated: {self.mask_account(email or accounts[index]['Email'])}{Style.RESET_ALL}")
+        except sqlite3.IntegrityError:
+            self.log(f"{Fore.RED}✗ Another account already uses that email{Style.RESET_ALL}")
+        except sqlite3.Error as e:
+            self.log(f"{Fore.RED}✗ Failed to save account: {e}{Style.RESET_ALL}")
         except ValueError:
             self.log(f"{Fore.RED}✗ Invalid input. Enter a number{Style.RESET_ALL}")
 
@@ -353,16 +2183,17 @@ class Dawn:
         if not accounts:
             self.log(f"{Fore.YELLOW}No accounts to delete{Style.RESET_ALL}")
             return
-        self.display_accounts()
+        self.display_accounts(accounts)
         try:
             index = int(input(f"{Fore.YELLOW + Style.BRIGHT}Select account number to delete (1-{len(accounts)}): {Style.RESET_ALL}").strip()) - 1
             if index < 0 or index >= len(accounts):
                 self.log(f"{Fore.RED}✗ Invalid account number{Style.RESET_ALL}")
                 return
             email = accounts[index]['Email']
-            del accounts[index]
-            self.save_accounts(accounts)
+            self.open_account_store().delete(email)
             self.log(f"{Fore.GREEN}✓ Account deleted: {self.mask_account(email)}{Style.RESET_ALL}")
+        except sqlite3.Error as e:
+            self.log(f"{Fore.RED}✗ Failed to delete account: {e}{Style.RESET_ALL}")
         except ValueError:
             self.log(f"{Fore.RED}✗ Invalid input. Enter a number{Style.RESET_ALL}")
 
@@ -399,141 +2230,601 @@ class Dawn:
                 self.log(f"{Fore.RED}✗ Invalid input. Enter a number{Style.RESET_ALL}")
                 input(f"{Fore.YELLOW + Style.BRIGHT}Press Enter to continue...{Style.RESET_ALL}")
 
-    async def user_data(self, app_id: str, email: str, token: str, proxy=None, retries=5):
-        url = f"{self.BASE_API}/api/atom/v1/userreferral/getpoint?appid={app_id}"
-        headers = {
-            **self.headers,
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
+    async def request(self, method: str, url: str, email: str, proxy=None, retries=None, endpoint="api", **kwargs):
+        from aiohttp import ClientResponseError
+        from aiohttp_socks import ProxyError
+        retries = retries or self.retry_policy.retries
+        error = None
         for attempt in range(retries):
+            if proxy and not self.proxy_pool.allow(proxy):
+                proxy = self.rotate_proxy_for_account(email)
+                if not proxy:
+                    error = error or ProxyError("No healthy proxy available")
+                    break
+            if attempt:
+                self.metrics.retry(endpoint, proxy)
+            delay = 0
+            started = time.monotonic()
+            measured = None
+            outcome = "cancelled"
             try:
-                proxies = proxy.as_proxies_dict if proxy else None
-                response = requests.get(url=url, headers=headers, proxies=proxies, timeout=120)
-                response.raise_for_status()
-                result = response.json()
-                return result["data"]
-            except (ProxyError, SSLError) as e:
-                if attempt < retries - 1:
-                    self.print_message(email, proxy, Fore.YELLOW, f"✗ Proxy error, retrying: {str(e)}")
-                    await asyncio.sleep(5)
+                async with self.open_request(proxy) as session:
+                    started = time.monotonic()
+                    measured = self.metrics.begin(endpoint, proxy)
+                    async with session.request(method, url, **kwargs) as response:
+                        response.raise_for_status()
+                        result = await response.json(content_type=None)
+                        self.record_proxy(proxy, True, started)
+                        outcome = "ok"
+                        return result["data"], proxy, None
+            except connect_errors() as e:
+                error = e
+                outcome = self.metrics.classify(e)
+                self.record_proxy(proxy, False)
+                if proxy:
+                    # The proxy is the likely culprit: switch right away instead of waiting
+                    proxy = self.rotate_proxy_for_account(email)
+                    if not proxy:
+                        break
+                    self.print_message(email, proxy, Fore.YELLOW, f"✗ Proxy error, switching proxy: {str(e)}")
                     continue
-                proxy = self.rotate_proxy_for_account(email) if proxy else None
-                self.print_message(email, proxy, Fore.YELLOW, f"✗ Failed to get data: {str(e)}")
-                return None
+                delay = self.retry_policy.backoff(attempt)
+            except ClientResponseError as e:
+                error = e
+                outcome = self.metrics.classify(e)
+                self.record_proxy(proxy, True, started)
+                if not self.retry_policy.is_retryable(e.status):
+                    break
+                delay = self.retry_policy.backoff(attempt, self.retry_policy.retry_after(e))
             except Exception as e:
-                if attempt < retries - 1:
-                    await asyncio.sleep(5)
-                    continue
-                self.print_message(email, proxy, Fore.YELLOW, f"✗ Failed to get data: {str(e)}")
-                return None
-
-    async def send_keepalive(self, app_id: str, email: str, token: str, use_proxy: bool, proxy=None, retries=5):
-        url = f"{self.BASE_API}/chromeapi/dawn/v1/userreward/keepalive?appid={app_id}"
-        data = json.dumps({"username": email, "extensionid": "fpdkjdnhkakefebpekbdhillbhonfjjp", "numberoftabs": 0, "_v": "1.1.6"})
-        headers = {
-            **self.headers,
-            "Authorization": f"Bearer {token}",
-            "Content-Length": str(len(data)),
-            "Content-Type": "application/json",
+                error = e
+                outcome = self.metrics.classify(e)
+                delay = self.retry_policy.backoff(attempt)
+            finally:
+                if measured:
+                    self.metrics.end(measured, outcome, time.monotonic() - started)
+            if attempt < retries - 1:
+                await asyncio.sleep(delay)
+        return None, proxy, error
+
+    def request_template(self, app_id: str, email: str, token: str) -> RequestTemplate:
+        state = self.account_states.get(email)
+        template = state.template if state else None
+        if template is None or template.token != token or template.app_id != app_id:
+            template = RequestTemplate(self.BASE_API, app_id, email, token, self.user_agent_for(email))
+            if state:
+                state.template = template
+        return template
+
+    async def user_data(self, app_id: str, email: str, token: str, proxy=None, retries=None):
+        template = self.request_template(app_id, email, token)
+        data, proxy, error = await self.request(
+            "GET", template.getpoint_url, email, proxy, retries, endpoint="getpoint", headers=template.headers
+        )
+        if error:
+            if self.is_auth_error(error):
+                self.quarantine_account(email, error.status, token)
+            else:
+                self.print_message(email, proxy, Fore.YELLOW, f"✗ Failed to get data: {str(error)}")
+        return data
+
+    async def send_keepalive(self, app_id: str, email: str, token: str, use_proxy: bool, proxy=None, retries=None):
+        template = self.request_template(app_id, email, token)
+        result, proxy, error = await self.request(
+            "POST", template.keepalive_url, email, proxy if use_proxy else None, retries,
+            endpoint="keepalive", headers=template.headers, data=template.keepalive_body
+        )
+        if error:
+            if self.is_auth_error(error):
+                self.quarantine_account(email, error.status, token)
+            else:
+                self.print_message(email, proxy, Fore.RED, f"✗ Ping failed: {str(error)}")
+        return result
+
+    @staticmethod
+    def is_auth_error(error) -> bool:
+        from aiohttp import ClientResponseError
+        return isinstance(error, ClientResponseError) and error.status in AUTH_ERROR_STATUSES
+
+    def quarantine_account(self, email: str, status: int, token: str):
+        # A rejected token will not start working by itself: stop the account's
+        # jobs outright until a new token shows up (see update_account_token).
+        # `token` is the one the request carried; a rejection of a token that
+        # has since been replaced by a reload says nothing about the new one.
+        state = self.account_states.get(email)
+        if state is None or state.token_valid is False or state.token != token:
+            return
+        state.token_valid = False
+        self.scheduler.remove(("keepalive", email))
+        self.scheduler.remove(("earning", email))
+        self.proxy_assigner.release(email)
+        state.template = None
+        self.print_message(email, None, Fore.RED, f"✗ Token rejected (HTTP {status}), account paused until its token changes")
+
+    def next_earning_interval(self, state: AccountState, changed: bool) -> float:
+        # Adaptive polling doubles the interval while the total stays put and
+        # drops back to the base interval as soon as it moves
+        if self.earning_mode == "demand":
+            return float("inf")
+        if self.earning_mode == "fixed" or changed or not state.earning_every:
+            return self.earning_interval
+        return min(state.earning_every * 2, self.earning_max_interval)
+
+    async def poll_earning(self, app_id: str, email: str, token: str, proxy=None):
+        user = await self.user_data(app_id, email, token, proxy)
+        state = self.account_states.get(email)
+        if not user or not state:
+            return
+        state.token_valid = True
+        total_points = self.point_extractor.total(user)
+        previous, changed = state.points, state.points != total_points
+        state.last_earning = time.time()
+        state.points = total_points
+        state.earning_every = self.next_earning_interval(state, changed)
+        state.next_earning = state.last_earning + state.earning_every
+        if previous is None:
+            self.print_message(email, proxy, Fore.GREEN, f"✓ Earning: {total_points:.0f} PTS")
+        elif changed:
+            self.print_message(email, proxy, Fore.GREEN, f"✓ Earning: {total_points:.0f} PTS ({total_points - previous:+.0f})")
+        else:
+            if self.log_sink.enabled("debug"):
+                self.log(f"{Fore.BLUE + Style.BRIGHT}Earnings unchanged: {self.mask_account(email)}{Style.RESET_ALL}", "debug")
+
+    # Scheduled jobs are shared functions called with their (job, email) key;
+    # everything else comes from the account's state when the job runs.
+    async def process_user_earning(self, key: tuple):
+        _, email = key
+        state = self.account_states.get(email)
+        if state is None:
+            return
+        use_proxy = self.use_proxy
+        proxy = self.get_next_proxy_for_account(email) if use_proxy else None
+        if use_proxy and not proxy:
+            self.print_message(email, proxy, Fore.YELLOW, "✗ No healthy proxy available, skipping")
+            return
+        await self.poll_earning(state.app_id, email, state.token, proxy)
+        if state.earning_every:
+            self.scheduler.set_interval(key, state.earning_every)
+
+    async def process_send_keepalive(self, key: tuple):
+        _, email = key
+        state = self.account_states.get(email)
+        if state is None:
+            return
+        use_proxy = self.use_proxy
+        proxy = self.get_next_proxy_for_account(email) if use_proxy else None
+        if use_proxy and not proxy:
+            self.print_message(email, proxy, Fore.YELLOW, "✗ No healthy proxy available, skipping")
+            return
+        # Debug lines are guarded so the ping path formats nothing unless asked
+        if self.log_sink.enabled("debug"):
+            self.log(f"{Fore.BLUE + Style.BRIGHT}Sending ping: {self.mask_account(email)}{Style.RESET_ALL}", "debug")
+        app_id, token = state.app_id, state.token
+        keepalive = await self.send_keepalive(app_id, email, token, use_proxy, proxy)
+        if keepalive and keepalive.get("success"):
+            server_name = keepalive.get("servername", "N/A")
+            state.last_ping = time.time()
+            state.token_valid = True
+            self.print_message(email, proxy, Fore.GREEN, f"✓ Ping successful | Server: {server_name}")
+            # Batched earnings ride on the ping's warm connection
+            if self.earning_mode in ("keepalive", "demand") and state.next_earning <= state.last_ping:
+                await self.poll_earning(app_id, email, token, proxy)
+        if self.log_sink.enabled("debug"):
+            self.log(f"{Fore.BLUE + Style.BRIGHT}Next ping in {self.format_seconds(self.ping_interval)}: {self.mask_account(email)}{Style.RESET_ALL}", "debug")
+
+    def request_earnings(self):
+        # On-demand poll: job-based modes poll within the next minute, batched
+        # modes with each account's next ping
+        if self.scheduler is None:
+            return
+        accounts = list(self.account_states.items())
+        for email, state in accounts:
+            state.next_earning = 0.0
+            self.scheduler.reschedule(("earning", email), random.uniform(0, min(60, self.earning_interval)))
+        self.log(f"{Fore.BLUE + Style.BRIGHT}Earnings poll requested for {len(accounts)} accounts{Style.RESET_ALL}")
+
+    def valid_accounts(self, accounts: list) -> dict[str, str]:
+        return {
+            account.get('Email'): account.get('Token') for account in accounts
+            if "@" in (account.get('Email') or '') and account.get('Token') and self.owns(account.get('Email'))
         }
-        for attempt in range(retries):
+
+    def start_account(self, email: str, token: str, offset: float, earning_offset: float | None = None,
+                      app_id: str | None = None, quarantined: bool = False):
+        state = self.account_states.get(email)
+        app_id = (state and state.app_id) or app_id or self.generate_app_id()
+        state = self.account_states[email] = AccountState(token, app_id)
+        if quarantined:
+            state.token_valid = False
+            return
+        self.schedule_account(email, offset, earning_offset)
+
+    def schedule_account(self, email: str, offset: float, earning_offset: float | None = None):
+        # Earnings polls sit half an interval after the account's ping so the
+        # two endpoints never fire together
+        state = self.account_states[email]
+        if earning_offset is None:
+            earning_offset = (offset + self.earning_interval / 2) % self.earning_interval
+        self.scheduler.add(("keepalive", email), self.job_funcs["keepalive"], self.ping_interval, offset)
+        if self.earning_mode in ("keepalive", "demand"):
+            state.next_earning = time.time() + earning_offset if self.earning_mode == "keepalive" else float("inf")
+            return
+        self.scheduler.add(("earning", email), self.job_funcs["earning"], self.earning_interval, earning_offset)
+
+    def update_account_token(self, email: str, token: str):
+        # Jobs read the token when they run, so a running account keeps its slot
+        # in the schedule
+        state = self.account_states[email]
+        state.token = token
+        if state.token_valid is False:
+            # Quarantined accounts come back within a minute, spread out in
+            # case a whole batch of tokens was refreshed at once
+            state.token_valid = None
+            self.schedule_account(email, random.uniform(0, min(self.ping_interval, 60)))
+            self.print_message(email, None, Fore.GREEN, "✓ New token, account resumed")
+
+    def stop_account(self, email: str):
+        self.scheduler.remove(("keepalive", email))
+        self.scheduler.remove(("earning", email))
+        self.proxy_assigner.release(email)
+        self.account_states.pop(email, None)
+        if self.dashboard:
+            self.dashboard.forget(email)
+
+    def reload_accounts(self):
+        accounts = self.valid_accounts(self.open_account_store().all())
+        states = self.account_states
+        removed = [email for email in states if email not in accounts]
+        changed = [email for email, token in accounts.items() if email in states and states[email].token != token]
+        added = [email for email in accounts if email not in states]
+        for email in removed:
+            self.stop_account(email)
+        for email in changed:
+            self.update_account_token(email, accounts[email])
+        for email in added:
+            # New accounts land at a random point of the interval instead of all at once
+            self.start_account(email, accounts[email], random.uniform(0, self.ping_interval))
+        if added or removed or changed:
+            self.log(
+                f"{Fore.GREEN + Style.BRIGHT}✓ Accounts reloaded: {Style.RESET_ALL}"
+                f"{Fore.WHITE + Style.BRIGHT}+{len(added)} -{len(removed)} ~{len(changed)} "
+                f"({len(self.account_states)} running){Style.RESET_ALL}"
+            )
+
+    async def reload_proxies(self, download: bool = False):
+        if not self.use_proxy:
+            return
+        try:
+            proxies = await self.read_proxies(self.proxy_choice, download)
+            # A download rewrote the file; the watcher must not reload it again
+            self.proxy_stamp = self.file_stamp(self.proxy_file)
+        except Exception as e:
+            self.log(f"{Fore.RED + Style.BRIGHT}✗ Proxy reload failed, keeping current list: {e}{Style.RESET_ALL}", "error")
+            return
+        if not proxies:
+            self.log(f"{Fore.RED + Style.BRIGHT}✗ Reloaded proxy list is empty, keeping current list{Style.RESET_ALL}", "error")
+            return
+        pool = self.new_proxy_pool(proxies)
+        if self.proxy_pool:
+            pool.inherit(self.proxy_pool)
+        await pool.check_all()
+        # Swapped only after the new pool is checked; accounts on surviving
+        # proxies keep their binding and pooled connections
+        self.proxies, self.proxy_pool = proxies, pool
+        self.sync_proxy_assigner()
+        self.log(
+            f"{Fore.GREEN + Style.BRIGHT}✓ Proxies reloaded: {Style.RESET_ALL}"
+            f"{Fore.WHITE + Style.BRIGHT}{len(pool.ranked)}/{len(proxies)} healthy{Style.RESET_ALL}"
+        )
+
+    @staticmethod
+    def file_stamp(filename: str) -> str | None:
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    async def watch_files(self):
+        store = self.open_account_store()
+        data_version = store.data_version()
+        self.proxy_stamp = self.file_stamp(self.proxy_file)
+        while True:
+            await asyncio.sleep(self.watch_interval)
             try:
-                proxies = proxy.as_proxies_dict if proxy else None
-                response = requests.post(url=url, headers=headers, data=data, proxies=proxies, timeout=120)
-                response.raise_for_status()
-                result = response.json()
-                return result["data"]
-            except (ProxyError, SSLError) as e:
-                if attempt < retries - 1:
-                    self.print_message(email, proxy, Fore.YELLOW, f"✗ Proxy error, retrying: {str(e)}")
-                    await asyncio.sleep(5)
-                    continue
-                proxy = self.rotate_proxy_for_account(email) if use_proxy else None
-                self.print_message(email, proxy, Fore.RED, f"✗ Ping failed: {str(e)}")
-                return None
-            except Exception as e:
-                if attempt < retries - 1:
-                    await asyncio.sleep(5)
-                    continue
-                self.print_message(email, proxy, Fore.RED, f"✗ Ping failed: {str(e)}")
-                proxy = self.rotate_proxy_for_account(email) if use_proxy else None
-                return None
+                imported = self.sync_accounts_file()
+                version = store.data_version()
+                if imported or version != data_version:
+                    data_version = version
+                    self.reload_accounts()
+            except sqlite3.Error as e:
+                self.log(f"{Fore.RED + Style.BRIGHT}✗ Account reload failed: {e}{Style.RESET_ALL}", "error")
+            stamp = self.file_stamp(self.proxy_file)
+            if self.use_proxy and stamp != self.proxy_stamp:
+                self.proxy_stamp = stamp
+                await self.reload_proxies()
+
+    def state_path(self) -> Path:
+        path = Path(self.state_file)
+        if self.shard_index is not None:
+            path = path.with_name(f"{path.stem}-shard-{self.shard_index}{path.suffix}")
+        return path
+
+    def load_state(self) -> dict:
+        if not self.state_interval:
+            return {}
+        path = self.state_path()
+        try:
+            with open(path, 'r') as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.log(f"{Fore.YELLOW + Style.BRIGHT}✗ Ignoring unreadable state file {path}: {e}{Style.RESET_ALL}", "warning")
+            return {}
+        # Version 1 snapshots lack only the rejected-token field
+        if not isinstance(state, dict) or state.get("version") not in (1, STATE_VERSION):
+            return {}
+        return state.get("accounts") or {}
 
-    async def process_user_earning(self, app_id: str, email: str, token: str, use_proxy: bool):
+    def snapshot_state(self) -> dict:
+        # [app_id, proxy, last_ping, last_earning, points, rejected token] per
+        # account, wall-clock timestamps so the schedule can be resumed after a
+        # restart; a rejected token is kept as a fingerprint only
+        assigned = self.proxy_assigner.assigned
+        return {
+            "version": STATE_VERSION,
+            "saved": time.time(),
+            "accounts": {
+                email: [
+                    state.app_id, assigned.get(email), state.last_ping, state.last_earning, state.points,
+                    AccountState.fingerprint(state.token) if state.token_valid is False else None
+                ]
+                for email, state in self.account_states.items()
+            },
+        }
+
+    def write_state(self, snapshot: dict):
+        path = self.state_path()
+        with self.state_lock:
+            if snapshot["saved"] < self.state_saved:
+                return
+            file = tempfile.NamedTemporaryFile('w', dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp", delete=False)
+            try:
+                with file:
+                    json.dump(snapshot, file, separators=(",", ":"))
+                os.replace(file.name, path)
+            except BaseException:
+                os.unlink(file.name)
+                raise
+            self.state_saved = snapshot["saved"]
+
+    def save_state(self):
+        try:
+            self.write_state(self.snapshot_state())
+        except OSError as e:
+            self.log(f"{Fore.RED + Style.BRIGHT}✗ Failed to save state: {e}{Style.RESET_ALL}", "error")
+
+    async def persist_state(self):
         while True:
-            proxy = self.get_next_proxy_for_account(email) if use_proxy else None
-            user = await self.user_data(app_id, email, token, proxy)
-            if user:
-                referral_point = user.get("referralPoint", {}).get("commission", 0)
-                reward_point = user.get("rewardPoint", {})
-                reward_points = sum(
-                    value for key, value in reward_point.items()
-                    if "points" in key.lower() and isinstance(value, (int, float))
-                )
-                total_points = referral_point + reward_points
-                self.print_message(email, proxy, Fore.GREEN, f"✓ Earning: {total_points:.0f} PTS")
-            await asyncio.sleep(10 * 60)
+            await asyncio.sleep(self.state_interval)
+            # The snapshot is taken on the loop; only serializing and writing it
+            # happen off the loop
+            snapshot = self.snapshot_state()
+            try:
+                await asyncio.to_thread(self.write_state, snapshot)
+            except OSError as e:
+                self.log(f"{Fore.RED + Style.BRIGHT}✗ Failed to save state: {e}{Style.RESET_ALL}", "error")
 
-    async def process_send_keepalive(self, app_id: str, email: str, token: str, use_proxy: bool):
+    @staticmethod
+    def resume_offset(last: float, interval: float, slot: float, now: float) -> float:
+        # Accounts still inside their interval pick up where they left off;
+        # overdue or unknown ones take their evenly spread slot rather than
+        # all firing at startup
+        remaining = last + interval - now
+        return remaining if last and 0 <= remaining <= interval else slot
+
+    async def report_metrics(self):
         while True:
-            proxy = self.get_next_proxy_for_account(email) if use_proxy else None
-            print(
-                f"{Fore.CYAN + Style.BRIGHT}╭─[{datetime.now().astimezone(wib).strftime('%x %X %Z')}]{Style.RESET_ALL}\n"
-                f"{Fore.CYAN + Style.BRIGHT}╰──▶{Style.RESET_ALL} {Fore.BLUE + Style.BRIGHT}Sending ping...{Style.RESET_ALL}",
-                end="\r",
-                flush=True
+            await asyncio.sleep(self.metrics_interval)
+            self.log(f"{Fore.BLUE + Style.BRIGHT}{self.metrics.summary()}{Style.RESET_ALL}")
+
+    def use_dashboard(self) -> bool:
+        # Shard workers share the supervisor's terminal, so they always log
+        if self.shard_index is not None or self.ui == "log":
+            return False
+        return self.ui == "dashboard" or (not self.headless and sys.stdout.isatty())
+
+    def on_job_error(self, key, error: Exception):
+        job, email = key
+        self.print_message(email, self.proxy_assigner.proxy_for(email), Fore.RED, f"✗ {job} job failed: {error}")
+
+    async def start_farming(self, accounts: list, use_proxy_choice: int):
+        use_proxy = use_proxy_choice in [1, 2]
+        self.use_proxy = use_proxy
+        self.proxy_choice = use_proxy_choice
+        self.log(
+            f"{Fore.GREEN + Style.BRIGHT}✓ Accounts loaded: {Style.RESET_ALL}"
+            f"{Fore.WHITE + Style.BRIGHT}{len(accounts)}{Style.RESET_ALL}"
+        )
+        proxy_checker = None
+        if use_proxy:
+            await self.load_proxies(use_proxy_choice)
+            if self.proxies:
+                await self.check_proxies()
+            proxy_checker = asyncio.create_task(self.run_proxy_checks())
+        self.log(f"{Fore.CYAN + Style.BRIGHT}━{Style.RESET_ALL}"*50)
+        self.scheduler = Scheduler(workers=self.workers, on_error=self.on_job_error)
+        valid_accounts = self.valid_accounts(accounts)
+        saved_state = self.load_state()
+        now = time.time()
+        resumed = quarantined_count = 0
+        for index, (email, token) in enumerate(valid_accounts.items()):
+            # Spread accounts evenly over the interval
+            offset = self.ping_interval * index / len(valid_accounts)
+            earning_offset = (offset + self.earning_interval / 2) % self.earning_interval
+            saved = saved_state.get(email)
+            if not saved or len(saved) not in (5, 6):
+                self.start_account(email, token, offset, earning_offset)
+                continue
+            app_id, proxy_url, last_ping, last_earning, points = saved[:5]
+            # Still the token that was rejected last run: stay quarantined
+            quarantined = len(saved) == 6 and saved[5] == AccountState.fingerprint(token)
+            quarantined_count += quarantined
+            self.start_account(
+                email, token,
+                self.resume_offset(last_ping, self.ping_interval, offset, now),
+                self.resume_offset(last_earning, self.earning_interval, earning_offset, now),
+                app_id, quarantined
             )
-            keepalive = await self.send_keepalive(app_id, email, token, use_proxy, proxy)
-            if keepalive and keepalive.get("success"):
-                server_name = keepalive.get("servername", "N/A")
-                self.print_message(email, proxy, Fore.GREEN, f"✓ Ping successful | Server: {server_name}")
-            print(
-                f"{Fore.CYAN + Style.BRIGHT}╭─[{datetime.now().astimezone(wib).strftime('%x %X %Z')}]{Style.RESET_ALL}\n"
-                f"{Fore.CYAN + Style.BRIGHT}╰──▶{Style.RESET_ALL} {Fore.BLUE + Style.BRIGHT}Waiting 10 minutes for next ping...{Style.RESET_ALL}",
-                end="\r",
-                flush=True
+            state = self.account_states[email]
+            state.last_ping, state.last_earning, state.points = last_ping, last_earning, points
+            if proxy_url and self.proxy_pool and not quarantined:
+                self.proxy_assigner.bind(email, proxy_url)
+            resumed += 1
+        if resumed:
+            self.log(
+                f"{Fore.GREEN + Style.BRIGHT}✓ Resumed state: {Style.RESET_ALL}"
+                f"{Fore.WHITE + Style.BRIGHT}{resumed}/{len(valid_accounts)} accounts"
+                f"{f' ({quarantined_count} with rejected tokens)' if quarantined_count else ''}{Style.RESET_ALL}"
             )
-            await asyncio.sleep(10 * 60)
-
-    async def process_accounts(self, app_id: str, email: str, token: str, use_proxy: bool):
-        tasks = [
-            asyncio.create_task(self.process_user_earning(app_id, email, token, use_proxy)),
-            asyncio.create_task(self.process_send_keepalive(app_id, email, token, use_proxy))
-        ]
-        await asyncio.gather(*tasks)
+        # The loaded account rows are not needed once every account has its state
+        del accounts, valid_accounts, saved_state
+        background = [proxy_checker] if proxy_checker else []
+        if self.state_interval:
+            background.append(asyncio.create_task(self.persist_state()))
+        if self.watch_interval:
+            background.append(asyncio.create_task(self.watch_files()))
+        if self.use_dashboard():
+            # Its header carries the metrics summary, so there are no summary lines
+            self.dashboard = Dashboard(self, self.dashboard_fps)
+            background.append(asyncio.create_task(self.dashboard.run()))
+        elif self.metrics_interval:
+            background.append(asyncio.create_task(self.report_metrics()))
+        if self.metrics_port:
+            background.append(asyncio.create_task(self.metrics.serve(port=self.metrics_port)))
+        self.log_sink.start()
+        try:
+            await self.scheduler.run()
+        finally:
+            for task in background:
+                task.cancel()
+            if self.dashboard:
+                # Hand the terminal back before the shutdown messages
+                self.dashboard.close()
+                self.dashboard = None
+            if self.state_interval:
+                self.save_state()
+            self.log_sink.stop()
 
     async def farming(self):
         try:
             accounts = self.load_accounts()
             if not accounts:
-                self.log(f"{Fore.RED + Style.BRIGHT}✗ No accounts loaded{Style.RESET_ALL}")
+                self.log(f"{Fore.RED + Style.BRIGHT}✗ No accounts loaded{Style.RESET_ALL}", "error")
                 input(f"{Fore.YELLOW + Style.BRIGHT}Press Enter to return to menu...{Style.RESET_ALL}")
                 return
             use_proxy_choice = self.print_question()
-            use_proxy = False
-            if use_proxy_choice in [1, 2]:
-                use_proxy = True
             self.clear_terminal()
             self.welcome()
-            self.log(
-                f"{Fore.GREEN + Style.BRIGHT}✓ Accounts loaded: {Style.RESET_ALL}"
-                f"{Fore.WHITE + Style.BRIGHT}{len(accounts)}{Style.RESET_ALL}"
-            )
-            if use_proxy:
-                await self.load_proxies(use_proxy_choice)
-            self.log(f"{Fore.CYAN + Style.BRIGHT}━{Style.RESET_ALL}"*50)
-            tasks = []
-            for account in accounts:
-                app_id = self.generate_app_id()
-                email = account.get('Email')
-                token = account.get('Token')
-                if app_id and "@" in email and token:
-                    tasks.append(asyncio.create_task(self.process_accounts(app_id, email, token, use_proxy)))
-            await asyncio.gather(*tasks)
+            await self.start_farming(accounts, use_proxy_choice)
         except Exception as e:
-            self.log(f"{Fore.RED+Style.BRIGHT}✗ Error: {e}{Style.RESET_ALL}")
+            self.log(f"{Fore.RED+Style.BRIGHT}✗ Error: {e}{Style.RESET_ALL}", "error")
             input(f"{Fore.YELLOW + Style.BRIGHT}Press Enter to return to menu...{Style.RESET_ALL}")
+        finally:
+            await self.session_pool.close()
+
+    async def reload(self):
+        if self.scheduler is None:
+            return
+        self.log(f"{Fore.BLUE + Style.BRIGHT}Reload requested{Style.RESET_ALL}")
+        try:
+            self.sync_accounts_file()
+            self.reload_accounts()
+        except sqlite3.Error as e:
+            self.log(f"{Fore.RED + Style.BRIGHT}✗ Account reload failed: {e}{Style.RESET_ALL}", "error")
+        await self.reload_proxies(download=True)
+
+    def install_signal_handlers(self, stop, reload, poll=None):
+        loop = asyncio.get_running_loop()
+        handlers = {signal.SIGINT: stop, signal.SIGTERM: stop}
+        if hasattr(signal, "SIGHUP"):
+            handlers[signal.SIGHUP] = reload
+        if poll and hasattr(signal, "SIGUSR1"):
+            handlers[signal.SIGUSR1] = poll
+        for signum, handler in handlers.items():
+            try:
+                loop.add_signal_handler(signum, handler)
+            except NotImplementedError:
+                # Windows event loops have no add_signal_handler
+                signal.signal(signum, lambda *_, handler=handler: loop.call_soon_threadsafe(handler))
+
+    def write_shard_status(self, accounts: int):
+        stats = self.metrics._get("global", "")
+        status = {
+            "shard": self.shard_index,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "accounts": accounts,
+            "requests": stats.requests,
+            "ok": stats.outcomes.get("ok", 0),
+            "in_flight": stats.in_flight,
+            "updated": time.time(),
+        }
+        path = self.status_dir / f"shard-{self.shard_index}.json"
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, 'w') as file:
+            json.dump(status, file)
+        os.replace(temp_path, path)
+
+    async def report_shard_status(self, accounts: int):
+        self.status_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            try:
+                self.write_shard_status(accounts)
+            except OSError as e:
+                self.log(f"{Fore.RED + Style.BRIGHT}✗ Failed to write shard status: {e}{Style.RESET_ALL}", "error")
+            await asyncio.sleep(min(self.metrics_interval or 10, 10))
+
+    async def run_headless(self) -> int:
+        accounts = [account for account in self.load_accounts() if self.owns(account.get('Email', ''))]
+        if not accounts and self.shard_index is not None:
+            # Not an error: with few accounts the hash ring can leave shards empty
+            self.log(f"{Fore.YELLOW + Style.BRIGHT}No accounts in this shard, nothing to do{Style.RESET_ALL}")
+            return 0
+        if not accounts:
+            self.log(f"{Fore.RED + Style.BRIGHT}✗ No accounts loaded{Style.RESET_ALL}", "error")
+            return 1
+        account_count = len(accounts)
+        farming = asyncio.create_task(self.start_farming(accounts, self.proxy_choice))
+        del accounts
+        background = set()
+        if self.shard_index is not None:
+            background.add(asyncio.create_task(self.report_shard_status(account_count)))
+
+        def stop():
+            self.log(f"{Fore.YELLOW + Style.BRIGHT}Shutdown requested, stopping...{Style.RESET_ALL}", "warning")
+            farming.cancel()
+
+        def reload():
+            task = asyncio.create_task(self.reload())
+            background.add(task)
+            task.add_done_callback(background.discard)
+
+        self.install_signal_handlers(stop, reload, self.request_earnings)
+        try:
+            await farming
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.log(f"{Fore.RED+Style.BRIGHT}✗ Error: {e}{Style.RESET_ALL}", "error")
+            return 1
+        finally:
+            for task in background:
+                task.cancel()
+            await self.session_pool.close()
+            self.log(f"{Fore.RED + Style.BRIGHT}✗ Bot stopped{Style.RESET_ALL}")
+        return 0
 
     def main_menu(self):
         while True:
@@ -559,9 +2850,92 @@ class Dawn:
                 self.log(f"{Fore.RED}✗ Invalid input. Enter a number{Style.RESET_ALL}")
                 input(f"{Fore.YELLOW + Style.BRIGHT}Press Enter to continue...{Style.RESET_ALL}")
 
+def parse_settings(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Dawn Validator auto ping bot")
+    parser.add_argument("--headless", action="store_true", default=None, help="start farming without the interactive menu")
+    parser.add_argument("--config", help="JSON file with any of the settings below (flags take precedence)")
+    parser.add_argument("--proxy-mode", choices=list(PROXY_MODES), help="monosans, private or none")
+    parser.add_argument("--accounts-file", help="accounts JSON file (imported into the account store whenever it changes)")
+    parser.add_argument("--accounts-db", help="account store path (default: accounts file with a .db suffix)")
+    parser.add_argument("--proxy-file", help="proxy list file")
+    parser.add_argument("--workers", type=int, help="scheduler worker pool size")
+    parser.add_argument("--max-concurrency", type=int, help="global cap on in-flight requests (0 = unlimited)")
+    parser.add_argument("--per-proxy-concurrency", type=int, help="in-flight requests per proxy (0 = unlimited)")
+    parser.add_argument("--per-proxy-rate", type=float, help="requests per second per proxy (0 = unlimited)")
+    parser.add_argument("--per-host-rate", type=float,
+                        help="requests per second to the API host (0 = unlimited, the default); keep it above "
+                             "accounts / ping interval or the schedule falls behind")
+    parser.add_argument("--session-limit", type=int, help="open connections per proxy session (0 = unlimited)")
+    parser.add_argument("--max-sessions", type=int, help="proxy sessions kept open at once (least recently used are closed)")
+    parser.add_argument("--session-idle-ttl", type=float, help="seconds before an unused proxy session is closed")
+    parser.add_argument("--max-accounts-per-proxy", type=int, help="sticky accounts-per-proxy cap (0 = unlimited)")
+    parser.add_argument("--proxy-check-concurrency", type=int, help="proxies probed at once during a health check")
+    parser.add_argument("--proxy-check-timeout", type=float, help="seconds before a proxy probe counts as failed")
+    parser.add_argument("--proxy-check-interval", type=float, help="seconds between proxy health checks")
+    parser.add_argument("--ping-interval", type=float, help="seconds between keepalive pings per account")
+    parser.add_argument("--earning-interval", type=float, help="seconds between earnings polls per account")
+    parser.add_argument("--earning-mode", choices=EARNING_MODES,
+                        help="fixed, adaptive (back off while points are unchanged), keepalive (poll with the ping) "
+                             "or demand (only after SIGUSR1)")
+    parser.add_argument("--earning-max-interval", type=float, help="longest adaptive earnings interval in seconds")
+    parser.add_argument("--log-level", choices=list(LOG_LEVELS))
+    parser.add_argument("--log-format", choices=LOG_FORMATS)
+    parser.add_argument("--ui", choices=UI_MODES,
+                        help="log (a line per event), dashboard (live status table) or auto (dashboard when "
+                             "farming from the menu in a terminal)")
+    parser.add_argument("--dashboard-fps", type=float, help="dashboard redraws per second")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on 127.0.0.1:PORT")
+    parser.add_argument("--metrics-interval", type=float, help="seconds between metrics summary lines (0 = off)")
+    parser.add_argument("--watch-interval", type=float,
+                        help="seconds between checks of the accounts/proxy files for hot reload (0 = off)")
+    parser.add_argument("--no-proxy-download", dest="proxy_download", action="store_false", default=None,
+                        help="reuse the existing proxy file instead of downloading the monosans list")
+    parser.add_argument("--shard-count", type=int, help="total shards across all hosts (> 1 runs the shard supervisor)")
+    parser.add_argument("--shard-ids", help="shards to run on this host, e.g. 0-3 or 0,2 (default: all)")
+    parser.add_argument("--status-dir", help="directory where shards publish their status")
+    parser.add_argument("--state-file", help="runtime state snapshot used to resume after a restart (per shard)")
+    parser.add_argument("--state-interval", type=float, help="seconds between state snapshots (0 = off)")
+    parser.add_argument("--base-api", help="Dawn API base URL (e.g. a local mock for load testing)")
+    parser.add_argument("--user-agents",
+                        help="file with one user agent per line, or 'fake-useragent' (default: bundled Chrome list)")
+    args = parser.parse_args(argv)
+
+    settings = dict(DEFAULT_SETTINGS)
+    if args.config:
+        with open(args.config, 'r') as file:
+            config = json.load(file)
+        unknown = set(config) - set(DEFAULT_SETTINGS)
+        if unknown:
+            parser.error(f"unknown settings in {args.config}: {', '.join(sorted(unknown))}")
+        # Config values get the same choices as their flags
+        for action in parser._actions:
+            if action.choices and action.dest in config and config[action.dest] not in action.choices:
+                parser.error(
+                    f"invalid {action.dest} in {args.config}: {config[action.dest]!r} "
+                    f"(choose from {', '.join(map(str, action.choices))})"
+                )
+        settings.update(config)
+    settings.update({key: value for key, value in vars(args).items() if key != "config" and value is not None})
+    try:
+        parse_shard_ids(settings["shard_ids"], settings["shard_count"])
+    except ValueError as e:
+        parser.error(str(e))
+    return settings
+
+def run_supervisor(bot: "Dawn", settings: dict) -> int:
+    if settings["proxy_mode"] == "monosans" and settings["proxy_download"]:
+        asyncio.run(bot.download_proxies(MONOSANS_PROXY_URL, settings["proxy_file"]))
+    return ShardSupervisor(settings, bot.log, bot.sync_accounts_file).run()
+
 if __name__ == "__main__":
+    settings = parse_settings()
+    bot = Dawn()
+    bot.configure(settings)
+    if settings["shard_count"] > 1:
+        sys.exit(run_supervisor(bot, settings))
+    if settings["headless"]:
+        sys.exit(asyncio.run(bot.run_headless()))
     try:
-        bot = Dawn()
         bot.main_menu()
     except KeyboardInterrupt:
         print(
@@ -0,0 +1,46 @@
+from functools import cached_property
+from typing import Literal
+
+from pydantic import BaseModel, Field, field_validator
+from pydantic.networks import HttpUrl, IPv4Address
+
+# Strict validation for proxy lines, kept apart from bot.py so pydantic is
+# only imported when a proxy list is actually validated (see ProxyRecord.validate)
+
+Protocol = Literal["http", "https", "socks4", "socks5"]
+
+class Proxy(BaseModel):
+    host: str
+    port: int = Field(gt=0, le=65535)
+    protocol: Protocol = "http"
+    login: str | None = None
+    password: str | None = None
+    refresh_url: str | None = None
+
+    @field_validator("host")
+    def host_validator(cls, v):
+        if v.replace(".", "").isdigit():
+            IPv4Address(v)
+        else:
+            HttpUrl(f"http://{v}")
+        return v
+
+    @field_validator("refresh_url")
+    def refresh_url_validator(cls, v):
+        if v:
+            HttpUrl(v)
+        return v
+
+    @field_validator("protocol")
+    def protocol_validator(cls, v):
+        if v not in ["http", "https", "socks4", "socks5"]:
+            raise ValueError("Only http, https, socks4, and socks5 protocols are supported")
+        return v
+
+    @cached_property
+    def as_url(self) -> str:
+        return (
+            f"{self.protocol}://"
+            + (f"{self.login}:{self.password}@" if self.login and self.password else "")
+            + f"{self.host}:{self.port}"
+        )
@@ -0,0 +1,51 @@
+import json
+
+from bot import AccountStore
+
+def write_accounts(path, emails):
+    path.write_text(json.dumps([{"Email": email, "Token": f"token-{email}"} for email in emails]))
+
+def emails(store):
+    return [account["Email"] for account in store.all()]
+
+def test_menu_delete_survives_reimport(tmp_path):
+    accounts_file = tmp_path / "accounts.json"
+    store = AccountStore(tmp_path / "accounts.db")
+    write_accounts(accounts_file, ["a@x.com", "b@x.com"])
+    store.import_json(accounts_file)
+    store.delete("a@x.com")
+    write_accounts(accounts_file, ["a@x.com", "b@x.com", "c@x.com"])
+    assert store.import_json(accounts_file) == 2
+    assert emails(store) == ["b@x.com", "c@x.com"]
+
+def test_menu_rename_survives_reimport(tmp_path):
+    accounts_file = tmp_path / "accounts.json"
+    store = AccountStore(tmp_path / "accounts.db")
+    write_accounts(accounts_file, ["a@x.com", "b@x.com"])
+    store.import_json(accounts_file)
+    store.update("a@x.com", new_email="d@x.com")
+    write_accounts(accounts_file, ["a@x.com", "b@x.com", "c@x.com"])
+    store.import_json(accounts_file)
+    assert emails(store) == ["d@x.com", "b@x.com", "c@x.com"]
+
+def test_removed_email_comes_back_after_leaving_the_file(tmp_path):
+    accounts_file = tmp_path / "accounts.json"
+    store = AccountStore(tmp_path / "accounts.db")
+    write_accounts(accounts_file, ["a@x.com", "b@x.com"])
+    store.import_json(accounts_file)
+    store.delete("a@x.com")
+    write_accounts(accounts_file, ["b@x.com"])
+    store.import_json(accounts_file)
+    write_accounts(accounts_file, ["a@x.com", "b@x.com"])
+    store.import_json(accounts_file)
+    assert emails(store) == ["b@x.com", "a@x.com"]
+
+def test_menu_add_clears_removed_email(tmp_path):
+    accounts_file = tmp_path / "accounts.json"
+    store = AccountStore(tmp_path / "accounts.db")
+    write_accounts(accounts_file, ["a@x.com"])
+    store.import_json(accounts_file)
+    store.delete("a@x.com")
+    store.add("a@x.com", "menu-token")
+    store.import_json(accounts_file)
+    assert store.get("a@x.com") == {"Email": "a@x.com", "Token": "menu-token"}